@@ -0,0 +1,165 @@
+"""Rolling-origin backtest for the projection models.
+
+    python backtest.py                    # every fold for both models, one process per core
+    python backtest.py skilled --first-target 2020 --n-jobs 2
+
+For each target season N+1 the model is trained the way the scripts train it,
+but only from seasons up to N: career averages over seasons <= N play the part
+of train.csv and season N plays the part of test.csv. It then projects N+1
+from each player's season N line and is scored against what actually
+happened. Folds run in parallel, one process per fold, and each fold records
+its accuracy, training and prediction wall-clock and peak memory. Every run
+is appended to models/backtests.csv so results can be compared over time.
+"""
+import argparse
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, r2_score
+from feature_engineering import build_features
+from player_analysis import read_seasons, season_paths
+from profootball_scrapping import player_tables, summarize_careers
+from projection_model import feature_fingerprint, fit_projection, models_dir, predict_projection
+from projection_service import projection_models
+
+try:
+    import resource  # Peak RSS; not available on Windows
+except ImportError:
+    resource = None
+
+history_path = os.path.join(models_dir, 'backtests.csv')
+
+# Season-by-season stats each model is backtested on, and the scraper table they came from
+backtest_sources = {
+    'skilled': (season_paths['scrimmage'], 'scrimmage'),
+    'passing': (season_paths['passing'], 'passing'),
+}
+
+# Skip early seasons with too few players to train or score on
+min_train_players = 30
+min_test_players = 10
+
+
+def load_seasons(name):
+    """One row per player season with its fantasy points"""
+    path, table = backtest_sources[name]
+    seasons = read_seasons(path).sort_values(['Player', 'Season']).reset_index(drop=True)
+    fantasy_points = player_tables[table][4]
+    seasons['FP'] = fantasy_points(seasons)
+    # A season missing any scoring stat has no target to train or score on
+    return seasons.dropna(subset=['FP']).reset_index(drop=True)
+
+
+def fold_frames(name, seasons, season):
+    """(careers, recent, upcoming) for training through season and projecting season + 1"""
+    columns_to_summarize, fantasy_points = player_tables[backtest_sources[name][1]][3:]
+    history = seasons[seasons['Season'] <= season]
+    careers = summarize_careers(history.assign(player_url=history['Player']), columns_to_summarize, fantasy_points)
+    recent = seasons[seasons['Season'] == season]
+    upcoming = seasons[seasons['Season'] == season + 1][['Player', 'FP']].rename(columns={'FP': 'Actual_FP'})
+    return (build_features(careers, name), build_features(recent, name),
+            recent.merge(upcoming, on='Player')[['Player', 'Actual_FP']])
+
+
+def run_fold(name, seasons, season):
+    """Train through season, project season + 1, and time and measure both"""
+    script = projection_models[name]
+    careers, recent, upcoming = fold_frames(name, seasons, season)
+    params = {**script.xgb_params, 'n_jobs': 1}
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    imputer, scaler, model = fit_projection(careers, recent, script.features, params,
+                                            script.weight_historical, script.weight_recent)[:3]
+    train_seconds = time.perf_counter() - start
+
+    clip_max = getattr(script, 'max_fp', careers['FP'].max() * 1.1)
+    artifact = {'name': name, 'features': script.features, 'imputer': imputer, 'scaler': scaler,
+                'model': model, 'clip_max': clip_max}
+    scored = recent.merge(upcoming, on='Player')
+    start = time.perf_counter()
+    predicted = predict_projection(artifact, scored)
+    predict_seconds = time.perf_counter() - start
+    python_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    actual = scored['Actual_FP'].to_numpy()
+    return {
+        'model': name,
+        'train_through': season,
+        'target_season': season + 1,
+        'train_players': len(careers),
+        'test_players': len(scored),
+        'r2': r2_score(actual, predicted),
+        'rmse': float(np.sqrt(np.mean((predicted - actual) ** 2))),
+        'mae': mean_absolute_error(actual, predicted),
+        # Drafts care about order more than exact points
+        'rank_corr': pd.Series(predicted).corr(pd.Series(actual), method='spearman'),
+        'train_seconds': train_seconds,
+        'predict_seconds': predict_seconds,
+        'python_peak_mb': python_peak / 2 ** 20,
+        # ru_maxrss is KiB on Linux; one fold per process makes it this fold's peak
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None,
+    }
+
+
+def backtest(name, first_target=None, n_jobs=-1):
+    """Run every rolling-origin fold for one model and return the per-fold table"""
+    seasons = load_seasons(name)
+    folds = []
+    for season in sorted(seasons['Season'].unique())[:-1]:
+        if first_target is not None and season + 1 < first_target:
+            continue
+        players = seasons.loc[seasons['Season'] <= season, 'Player'].nunique()
+        returning = len(set(seasons.loc[seasons['Season'] == season, 'Player'])
+                        & set(seasons.loc[seasons['Season'] == season + 1, 'Player']))
+        if players >= min_train_players and returning >= min_test_players:
+            folds.append(season)
+
+    workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+    start = time.perf_counter()
+    # A fresh process per fold, so each fold's peak memory is its own
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        results = list(pool.map(run_fold, [name] * len(folds), [seasons] * len(folds), folds))
+    elapsed = time.perf_counter() - start
+
+    table = pd.DataFrame(results)
+    print(f"{name}: {len(folds)} folds on {workers} workers in {elapsed:.1f}s")
+    return table
+
+
+def record_history(table, path=history_path):
+    """Append a run's folds to the backtest history, tagged with the run time and model settings"""
+    table = table.assign(
+        run_started=datetime.now().isoformat(timespec='seconds'),
+        feature_fingerprint=[feature_fingerprint(projection_models[name].features) for name in table['model']],
+        params=[repr(projection_models[name].xgb_params) for name in table['model']],
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of the projection models")
+    parser.add_argument('models', nargs='*', metavar='model',
+                        help=f"Models to backtest: {', '.join(backtest_sources)} (default: all)")
+    parser.add_argument('--first-target', type=int, default=None, help="Earliest season to project")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Worker processes (-1 for all cores)")
+    parser.add_argument('--no-history', action='store_true', help=f"Don't append results to {history_path}")
+    args = parser.parse_args()
+
+    unknown = [model_name for model_name in args.models if model_name not in backtest_sources]
+    if unknown:
+        parser.error(f"unknown models {unknown}, choose from {list(backtest_sources)}")
+
+    for model_name in args.models or list(backtest_sources):
+        results = backtest(model_name, args.first_target, args.n_jobs)
+        summary = results[['r2', 'rmse', 'mae', 'rank_corr', 'train_seconds', 'predict_seconds']].mean()
+        print(results.round(3).to_string(index=False))
+        print("Mean over folds: " + ', '.join(f"{key} {value:.3f}" for key, value in summary.items()) + '\n')
+        if not args.no_history:
+            record_history(results)
@@ -0,0 +1,216 @@
+"""Draft snapshots, so a draft survives a browser refresh, a server restart or a logout.
+
+A snapshot is one JSON-lines file per registered user (guests' drafts are
+not saved). The first line has the format version, the league settings,
+team names, ranking mode and the player pool as it was loaded, so
+restoring never re-reads the rankings or projections. Every later line is
+one event, appended as it happens: a pick is just [team, player id], so
+saving a pick writes a few bytes instead of the whole draft. Switching
+ranking mode writes that mode's pool the first time only; switching back
+is just the mode name. Restoring reads the file and the app replays the
+events.
+
+    python draft_snapshot.py                # benchmark saving and reading a full synthetic draft
+    python draft_snapshot.py --teams 12 --rounds 15 --players 500
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+snapshot_version = 1
+snapshots_dir = os.path.join('data_used', 'drafts')
+# Pool columns, in the order of read_rankings' pool tuples
+pool_columns = ('id', 'name', 'pos', 'team', 'bye', 'rank')
+
+
+def snapshot_path(username, directory=snapshots_dir):
+    """Where a user's draft snapshot lives; the name is hashed so any username is a safe file name"""
+    return os.path.join(directory, hashlib.sha256(username.encode()).hexdigest()[:16] + '.jsonl')
+
+
+def encode_line(record):
+    """One compact JSON line"""
+    return json.dumps(record, separators=(',', ':')) + '\n'
+
+
+def pool_record(players):
+    """Column lists for a pool of players (anything with id, name, pos, team, bye and avg_rank)"""
+    return {
+        'id': [player.id for player in players],
+        'name': [player.name for player in players],
+        'pos': [player.pos for player in players],
+        'team': [player.team for player in players],
+        'bye': [player.bye for player in players],
+        'rank': [player.avg_rank for player in players],
+    }
+
+
+def pool_rows(record):
+    """(player id, name, position, team, bye, rank) tuples back from pool_record columns"""
+    return list(zip(*(record[column] for column in pool_columns)))
+
+
+class DraftJournal:
+    """Appends a draft's events to its snapshot file as they happen.
+
+    pools is {ranking type: pool_record} for the pools already in the file,
+    as read_snapshot returns them when a draft is resumed.
+    """
+
+    def __init__(self, path, pools=None):
+        self.path = path
+        self.pools = dict(pools or {})
+
+    @classmethod
+    def start(cls, path, settings, team_names, ranking_type, players):
+        """Begin a new snapshot for a draft, replacing any earlier one at path"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        pool = pool_record(players)
+        header = {'version': snapshot_version, 'settings': settings, 'team_names': team_names,
+                  'ranking_type': ranking_type, 'pool': pool}
+        # Written aside and renamed, so a crash mid-write never leaves half a header where the old draft was
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(encode_line(header))
+        os.replace(path + '.tmp', path)
+        return cls(path, {ranking_type: pool})
+
+    def append(self, record):
+        """Add one event line, starting a fresh line if a crash cut the last one short"""
+        line = encode_line(record).encode('utf-8')
+        with open(self.path, 'r+b') as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b'\n':
+                    line = b'\n' + line
+            f.write(line)
+
+    def record_pick(self, team_number, player_id):
+        self.append([team_number, player_id])
+
+    def record_pool(self, ranking_type, players):
+        """The pool was reloaded, e.g. switching between expert and ML rankings.
+
+        A pool already in the file is referred to by its ranking type, so
+        toggling modes adds a few bytes per switch; only a changed pool (the
+        rankings or projections were updated mid-draft) is written again.
+        """
+        pool = pool_record(players)
+        if self.pools.get(ranking_type) == pool:
+            self.append({'ranking_type': ranking_type})
+        else:
+            self.pools[ranking_type] = pool
+            self.append({'ranking_type': ranking_type, 'pool': pool})
+
+    def record_team_name(self, team_number, name):
+        self.append({'team': team_number, 'name': name})
+
+
+def read_snapshot(path):
+    """A saved draft as {settings, team_names, ranking_type, pool, events, pools}, or None if there is none.
+
+    pool is the first pool's rows and ranking_type its mode. events holds
+    ('pick', team, player id) and ('pool', ranking type, rows) in draft
+    order, for the caller to replay; renames are already folded into
+    team_names. pools is the latest pool_record per ranking type, for a
+    resumed DraftJournal. A line cut short by a crash is skipped. Raises
+    ValueError for a snapshot from an unknown format version.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return None
+    if not lines:
+        return None
+
+    header = json.loads(lines[0])
+    if header.get('version') != snapshot_version:
+        raise ValueError(f"Draft snapshot version {header.get('version')} is not supported "
+                         f"(expected {snapshot_version})")
+    team_names = {int(team): name for team, name in header['team_names'].items()}
+    pools = {header['ranking_type']: header['pool']}
+    first_pool = pool_rows(header['pool'])
+    rows = {header['ranking_type']: first_pool}
+    events = []
+    for line in lines[1:]:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # Only the event being written when the app died is lost; later events start on their own line
+            continue
+        if isinstance(record, list):
+            events.append(('pick', record[0], record[1]))
+        elif 'ranking_type' in record:
+            ranking_type = record['ranking_type']
+            if 'pool' in record:
+                pools[ranking_type] = record['pool']
+                rows[ranking_type] = pool_rows(record['pool'])
+            elif ranking_type not in rows:
+                raise ValueError(f"Draft snapshot {path} switches to {ranking_type} rankings before saving that pool")
+            events.append(('pool', ranking_type, rows[ranking_type]))
+        elif 'team' in record:
+            team_names[int(record['team'])] = record['name']
+    return {'settings': header['settings'], 'team_names': team_names, 'ranking_type': header['ranking_type'],
+            'pool': first_pool, 'events': events, 'pools': pools}
+
+
+def delete_snapshot(path):
+    """Forget a saved draft"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def benchmark_snapshot(teams=12, rounds=15, players=500, repeat=20):
+    """Per-pick save time, snapshot size and read time for a full synthetic draft"""
+
+    class SyntheticPlayer:
+        def __init__(self, number):
+            self.id = (number * 0x9E3779B97F4A7C15) % (1 << 63)
+            self.name = f"Player {number} Lastname"
+            self.pos = ['QB', 'RB', 'WR', 'TE', 'K', 'DST'][number % 6]
+            self.team = f"T{number % 32}"
+            self.bye = str(number % 14 + 5)
+            self.avg_rank = float(number + 1)
+
+    pool = [SyntheticPlayer(number) for number in range(players)]
+    settings = {'total_teams': teams, 'your_position': 1, 'total_rounds': rounds, 'auto_draft': True,
+                'lineup_settings': {'QB': 1, 'RB': 2, 'WR': 2, 'TE': 1, 'K': 1, 'DST': 1, 'FLEX': 1},
+                'roster_limits': {'QB': 2, 'RB': 4, 'WR': 4, 'TE': 2, 'K': 2, 'DST': 2}}
+    picks = min(teams * rounds, players)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'draft.jsonl')
+        start = time.perf_counter()
+        journal = DraftJournal.start(path, settings, {team: f"Team {team}" for team in range(1, teams + 1)},
+                                     'expert', pool)
+        start_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for pick in range(picks):
+            journal.record_pick(pick % teams + 1, pool[pick].id)
+        pick_us = (time.perf_counter() - start) / picks * 1e6
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            snapshot = read_snapshot(path)
+        read_ms = (time.perf_counter() - start) / repeat * 1000
+    return {'start_ms': start_ms, 'pick_us': pick_us, 'read_ms': read_ms, 'bytes': size,
+            'picks': len(snapshot['events'])}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark draft snapshots on a synthetic draft")
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--rounds', type=int, default=15)
+    parser.add_argument('--players', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    result = benchmark_snapshot(args.teams, args.rounds, args.players, args.repeat)
+    print(f"{result['picks']} picks | header {result['start_ms']:.1f} ms, {result['pick_us']:.0f} us per pick | "
+          f"{result['bytes'] / 1024:.1f} KiB | read {result['read_ms']:.2f} ms")
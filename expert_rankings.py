@@ -0,0 +1,141 @@
+"""Expert rankings ingest (rankings3.csv).
+
+One streaming pass over the file yields both the position of every ranked
+player, which the ML rankings join on, and the expert-ranked player pool.
+
+    python expert_rankings.py               # benchmark on a 5,000-row synthetic rankings file
+    python expert_rankings.py --rows 20000 --repeat 10
+"""
+import csv
+import os
+import tempfile
+import time
+from player_ids import normalize_name, player_id
+
+rankings_path = os.path.join('data_used', 'rankings3.csv')
+default_rank = 999
+
+
+def base_position(full_pos):
+    """Position without its positional rank: WR12 -> WR"""
+    return full_pos.rstrip('0123456789')
+
+
+def read_rankings(path=rankings_path):
+    """(positions, pool) from one pass over an expert rankings CSV.
+
+    positions is {player id: base position}. pool is one
+    (player id, name, position, team, bye, rank) tuple per player in file
+    order; a player listed twice keeps their first row.
+    """
+    positions = {}
+    pool = []
+    # utf-8-sig drops a BOM if the export has one; newline='' lets csv handle quoted fields
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return positions, pool
+        columns = {name.strip(): index for index, name in enumerate(header)}
+        player_col, pos_col, rank_col = columns['Player'], columns['POS'], columns.get('Rank')
+        team_col, bye_col = columns.get('TEAM'), columns.get('BYE WEEK')
+
+        for row in reader:
+            if len(row) <= max(player_col, pos_col):
+                continue
+            name = row[player_col]
+            key = player_id(name)
+            if key in positions:
+                continue
+            pos = base_position(row[pos_col])
+            positions[key] = pos
+            try:
+                rank = float(row[rank_col]) if rank_col is not None else default_rank
+            except (ValueError, IndexError):
+                rank = default_rank
+            team = row[team_col] if team_col is not None and team_col < len(row) else ''
+            bye = row[bye_col] if bye_col is not None and bye_col < len(row) else ''
+            pool.append((key, name, pos, team, bye, rank))
+    return positions, pool
+
+
+def read_rankings_two_pass(path=rankings_path):
+    """Original ingest, kept for benchmarking: a whole-file rewrite for positions, then a second read for the pool"""
+    player_positions = {}
+    with open(path, 'r', encoding='utf-8') as file:
+        content = file.read().replace('"', '').strip('\ufeff')
+        lines = content.split('\n')
+        reader = csv.DictReader(lines)
+        for row in reader:
+            full_pos = row.get('POS', '')
+            base_pos = ''.join(c for c in full_pos if not c.isdigit())
+            player_positions[row['Player'].lower()] = base_pos
+
+    seen_players = set()
+    pool = []
+    with open(path, 'r', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            player_name = row['Player']
+            if player_name.lower() in seen_players:
+                continue
+            full_pos = row.get('POS', '')
+            player_pos = ''.join(c for c in full_pos if not c.isdigit())
+            try:
+                rank_value = float(row.get('Rank', default_rank))
+            except ValueError:
+                rank_value = default_rank
+            pool.append((player_name, player_pos, row.get('Team', ''), row.get('Bye', ''), rank_value))
+            seen_players.add(player_name.lower())
+    return player_positions, pool
+
+
+def write_synthetic_rankings(path, rows):
+    """A rankings3.csv-shaped file with rows players, quoted the way the FantasyPros export is"""
+    positions = ['WR', 'RB', 'WR', 'QB', 'TE', 'RB', 'WR', 'K', 'DST']
+    suffixes = ['', '', '', ' Jr.', '', ' III', '']
+    counts = {}
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        f.write('"Rank",TIERS,"Player",TEAM,"POS","BYE WEEK","SOS SEASON","ECR VS. ADP"\n')
+        for rank in range(1, rows + 1):
+            pos = positions[rank % len(positions)]
+            counts[pos] = counts.get(pos, 0) + 1
+            name = f"Ja'Player{rank} Last{rank % 97}{suffixes[rank % len(suffixes)]}"
+            f.write(f'"{rank}",{rank // 32 + 1},"{name}",T{rank % 32},"{pos}{counts[pos]}",'
+                    f'"{rank % 14 + 5}","{rank % 5 + 1} out of 5 stars","{rank % 21 - 10:+d}"\n')
+
+
+def benchmark_ingest(rows=5000, repeat=5):
+    """Time the one-pass ingest against the original two-pass read on a synthetic rankings file"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'rankings.csv')
+        write_synthetic_rankings(path, rows)
+        results = {}
+        for label, ingest in [('two_pass', read_rankings_two_pass), ('one_pass', read_rankings)]:
+            # The first read normalizes every name; later reads hit the player id cache, as app reruns do
+            player_id.cache_clear()
+            normalize_name.cache_clear()
+            start = time.perf_counter()
+            ingest(path)
+            first_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            for _ in range(repeat):
+                positions, pool = ingest(path)
+            results[label] = {'first_ms': first_ms, 'ms': (time.perf_counter() - start) / repeat * 1000,
+                              'positions': len(positions), 'players': len(pool)}
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the expert rankings ingest on a synthetic file")
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    results = benchmark_ingest(args.rows, args.repeat)
+    for label, result in results.items():
+        print(f"{label}: first read {result['first_ms']:.1f} ms, then {result['ms']:.1f} ms | "
+              f"{result['players']} players, {result['positions']} positions")
+    print(f"speedup: {results['two_pass']['ms'] / results['one_pass']['ms']:.1f}x")
@@ -0,0 +1,87 @@
+import hashlib
+import glob
+import os
+import numpy as np
+import pandas as pd
+
+# Engineered frames are cached here, one file per source CSV contents and feature set
+feature_cache_dir = os.path.join('data_used', 'feature_cache')
+# Bump to throw away every cached frame, e.g. after changing how ratios are computed
+cache_format = 1
+
+# Ratio features for each model: name -> (numerator columns summed, denominator column).
+# A denominator of 0 is treated as 1, so a player with no attempts gets the raw numerator.
+feature_sets = {
+    'passing': {
+        # Passing efficiency metrics
+        'TD_Rate': (['TD'], 'Att'),
+        'Int_Rate': (['Int'], 'Att'),
+        'Comp_Rate': (['Cmp'], 'Att'),
+        'YPA': (['Yds'], 'Att'),
+        'Points_Per_Game': (['FP'], 'G'),
+        'TD_Per_Game': (['TD'], 'G'),
+    },
+    'skilled': {
+        'YPA': (['Yds'], 'Att'),             # Yards per attempt
+        'YPT': (['Yds'], 'Tgt'),             # Yards per target
+        'TD_Rate': (['TD'], 'Att'),          # TD rate
+        'Usage': (['Att', 'Tgt'], 'G'),      # Usage rate
+    },
+}
+
+
+def add_ratio_features(df, ratios):
+    """Add every ratio column in one assign.
+
+    Each denominator column is converted and zero-guarded once and shared by
+    all the ratios that divide by it.
+    """
+    denominators = {}
+    for _, denominator in ratios.values():
+        if denominator not in denominators:
+            values = df[denominator].to_numpy(dtype=float)
+            denominators[denominator] = np.where(values == 0, 1.0, values)
+
+    new_columns = {}
+    for name, (numerators, denominator) in ratios.items():
+        numerator = df[numerators[0]].to_numpy(dtype=float)
+        for col in numerators[1:]:
+            numerator = numerator + df[col].to_numpy(dtype=float)
+        new_columns[name] = numerator / denominators[denominator]
+    return df.assign(**new_columns)
+
+
+def build_features(df, feature_set):
+    """Engineered frame for one model from a career CSV's rows"""
+    return add_ratio_features(df, feature_sets[feature_set])
+
+
+def cache_key(path, feature_set):
+    """Hash of the CSV's bytes, the feature definitions and the cache format"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        digest.update(f.read())
+    digest.update(repr((cache_format, feature_set, sorted(feature_sets[feature_set].items()))).encode())
+    return digest.hexdigest()[:16]
+
+
+def load_feature_frame(path, feature_set, cache_dir=feature_cache_dir, **read_csv_kwargs):
+    """Read a career CSV with its engineered features, from the disk cache when the CSV is unchanged"""
+    source = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(cache_dir, f'{source}-{feature_set}-{cache_key(path, feature_set)}.pkl')
+    if os.path.exists(cache_path):
+        return pd.read_pickle(cache_path)
+
+    df = pd.read_csv(path, **read_csv_kwargs)
+    # Strip whitespace from column names
+    df.columns = df.columns.str.strip()
+    features = build_features(df, feature_set)
+
+    # Replace any frame cached from an older version of the CSV
+    os.makedirs(cache_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(cache_dir, f'{glob.escape(source)}-{feature_set}-*.pkl')):
+        os.remove(stale)
+    tmp_path = cache_path + '.tmp'
+    features.to_pickle(tmp_path)
+    os.replace(tmp_path, cache_path)
+    return features
@@ -0,0 +1,184 @@
+"""Cross-validated hyperparameter search for the projection models.
+
+    python hyperparameter_search.py                          # 40 random configs for both models
+    python hyperparameter_search.py passing --grid --param max_depth=2,3 --param learning_rate=0.01,0.05
+
+Every configuration is scored with the same KFold split the model scripts
+use. All configurations are first scored on one fold and only the best
+--keep fraction go on to the remaining folds, so poor settings are dropped
+early. Each fit also stops adding trees once its validation fold stops
+improving. Fits run in a process pool across all cores, with XGBoost's hist
+tree method. Results are printed and saved to models/search/ as a CSV.
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold
+from xgboost import XGBRegressor
+from projection_model import models_dir, prepare_training_data
+from projection_service import projection_models
+
+results_dir = os.path.join(models_dir, 'search')
+
+# Values tried for each parameter; anything not listed keeps the model script's setting
+search_space = {
+    'n_estimators': [300, 600, 1000],  # Upper bound, early stopping usually ends sooner
+    'learning_rate': [0.01, 0.03, 0.1],
+    'max_depth': [2, 3, 4, 6],
+    'min_child_weight': [1, 5, 10],
+    'subsample': [0.6, 0.7, 0.85, 1.0],
+    'colsample_bytree': [0.6, 0.7, 0.85, 1.0],
+    'gamma': [0, 1, 2],
+    'reg_alpha': [0, 0.5, 1],
+    'reg_lambda': [1, 2, 5],
+}
+
+
+def grid_configs(space):
+    """Every combination of the values in space"""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_configs(space, count, seed=42):
+    """count distinct random combinations of the values in space"""
+    rng = random.Random(seed)
+    total = math.prod(len(values) for values in space.values())
+    configs = {}
+    while len(configs) < min(count, total):
+        config = {name: rng.choice(values) for name, values in space.items()}
+        configs[tuple(config.items())] = config
+    return list(configs.values())
+
+
+def fit_fold(X, y, train_index, val_index, params, early_stopping_rounds):
+    """Fit one configuration on one fold; returns (R², trees used, seconds)"""
+    start = time.perf_counter()
+    model = XGBRegressor(**params, early_stopping_rounds=early_stopping_rounds)
+    model.fit(X[train_index], y[train_index], eval_set=[(X[val_index], y[val_index])], verbose=False)
+    # predict uses the best iteration found by early stopping
+    score = r2_score(y[val_index], model.predict(X[val_index]))
+    return score, model.best_iteration + 1, time.perf_counter() - start
+
+
+def run_folds(pool, X, y, folds, configs, fold_numbers, early_stopping_rounds):
+    """Score every (config, fold) pair in the pool; returns {config_id: [(fold, R², trees, seconds)]}"""
+    futures = {
+        (config_id, fold): pool.submit(fit_fold, X, y, *folds[fold], params, early_stopping_rounds)
+        for config_id, params in configs.items()
+        for fold in fold_numbers
+    }
+    results = {config_id: [] for config_id in configs}
+    for (config_id, fold), future in futures.items():
+        results[config_id].append((fold, *future.result()))
+    return results
+
+
+def search(name, configs, n_splits=5, n_jobs=-1, keep=0.34, early_stopping_rounds=30):
+    """Cross-validate configs for one projection model and return a results table, best first"""
+    script = projection_models[name]
+    train_data = script.load_data(script.train_path)
+    test_data = script.load_data(script.test_path)
+    X, y = prepare_training_data(train_data, test_data, script.features,
+                                 script.weight_historical, script.weight_recent)[2:]
+
+    # Use KFold instead of default CV for more stable results
+    kf = KFold(n_splits=n_splits, shuffle=True, random_state=42)
+    folds = list(kf.split(X))
+
+    # One thread per fit, so the pool rather than XGBoost spreads the work over the cores
+    base_params = {**script.xgb_params, 'tree_method': 'hist', 'n_jobs': 1}
+    candidates = {config_id: {**base_params, **config} for config_id, config in enumerate(configs)}
+    workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Every config gets the first fold; only the best share earn the rest
+        results = run_folds(pool, X, y, folds, candidates, [0], early_stopping_rounds)
+        ranked = sorted(results, key=lambda config_id: results[config_id][0][1], reverse=True)
+        survivors = ranked[:max(1, math.ceil(len(ranked) * keep))]
+        remaining = run_folds(pool, X, y, folds, {config_id: candidates[config_id] for config_id in survivors},
+                              range(1, n_splits), early_stopping_rounds)
+        for config_id, fold_results in remaining.items():
+            results[config_id].extend(fold_results)
+    elapsed = time.perf_counter() - start
+
+    rows = []
+    for config_id, fold_results in results.items():
+        scores = np.array([score for _, score, _, _ in fold_results])
+        rows.append({
+            'config': config_id,
+            **configs[config_id],
+            'folds': len(fold_results),
+            'mean_r2': scores.mean(),
+            'std_r2': scores.std(),
+            'first_fold_r2': fold_results[0][1],
+            'trees': np.mean([trees for _, _, trees, _ in fold_results]),
+            'fit_seconds': sum(seconds for _, _, _, seconds in fold_results),
+            'pruned': len(fold_results) < n_splits,
+        })
+    table = pd.DataFrame(rows).sort_values(['pruned', 'mean_r2'], ascending=[True, False]).reset_index(drop=True)
+    print(f"{name}: {len(configs)} configs, {len(survivors)} kept after fold 1, "
+          f"{table['folds'].sum()} fits on {workers} workers in {elapsed:.1f}s")
+    return table
+
+
+def save_results(name, table, directory=results_dir):
+    """Write a search's results table to models/search/<name>-<timestamp>.csv"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.csv")
+    table.to_csv(path, index=False)
+    return path
+
+
+def parse_value(text):
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hyperparameter search for the projection models")
+    parser.add_argument('models', nargs='*', metavar='model',
+                        help=f"Models to tune: {', '.join(projection_models)} (default: all)")
+    parser.add_argument('--grid', action='store_true', help="Try every combination instead of a random sample")
+    parser.add_argument('--random', type=int, default=40, help="Random configurations to try (default 40)")
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=V1,V2',
+                        help="Replace the values searched for one parameter")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Worker processes (-1 for all cores)")
+    parser.add_argument('--keep', type=float, default=0.34,
+                        help="Share of configs scored on the remaining folds after the first")
+    parser.add_argument('--early-stopping', type=int, default=30,
+                        help="Stop a fit after this many rounds without improvement")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--top', type=int, default=10, help="Rows of the results table to print")
+    args = parser.parse_args()
+
+    unknown = [model_name for model_name in args.models if model_name not in projection_models]
+    if unknown:
+        parser.error(f"unknown models {unknown}, choose from {list(projection_models)}")
+
+    space = dict(search_space)
+    for override in args.param:
+        param_name, _, values = override.partition('=')
+        if not values:
+            parser.error(f"--param needs NAME=V1,V2, got {override}")
+        space[param_name] = [parse_value(value) for value in values.split(',')]
+
+    configs = grid_configs(space) if args.grid else random_configs(space, args.random, args.seed)
+    for model_name in args.models or list(projection_models):
+        results = search(model_name, configs, args.folds, args.n_jobs, args.keep, args.early_stopping)
+        print(results.head(args.top).to_string())
+        print(f"Saved results to {save_results(model_name, results)}\n")
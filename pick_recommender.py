@@ -0,0 +1,193 @@
+"""Lookahead pick recommendations.
+
+Before one of my picks, the opponents' picks until my next turn are
+simulated many times with the auto-draft model. Every rollout runs at
+once: each simulated pick is a few numpy operations over a
+(rollouts x players) availability matrix. Rollouts run in batches until
+the time budget is spent. For each position the result is the value I
+would lose by waiting: the best value there now minus the expected best
+value left at my next pick. Candidates are ranked by their own value plus
+that drop-off.
+"""
+import time
+import numpy as np
+import pandas as pd
+
+draft_positions = ['QB', 'RB', 'WR', 'TE', 'K', 'DST']
+position_index = {pos: code for code, pos in enumerate(draft_positions)}
+# The auto-draft looks at this many of the best available players at each position it needs
+auto_draft_candidates = 3
+# A positional run is judged over this many of the league's latest picks; a full window of one position doubles
+# the auto-draft's interest in it
+run_window = 5
+
+
+def round_position_weights(current_round):
+    """Auto-draft preference for each position in a round"""
+    if current_round <= 4:
+        # First 4 rounds: Focus heavily on RB/WR
+        return {'RB': 0.5, 'WR': 0.4, 'TE': 0.07, 'QB': 0.03, 'DST': 0, 'K': 0}
+    elif current_round <= 8:
+        # Middle rounds: Start considering QB/TE more
+        return {'RB': 0.35, 'WR': 0.35, 'TE': 0.15, 'QB': 0.15, 'DST': 0, 'K': 0}
+    elif current_round <= 13:
+        # Later rounds: Consider all positions except K/DST
+        return {'RB': 0.25, 'WR': 0.25, 'TE': 0.25, 'QB': 0.25, 'DST': 0, 'K': 0}
+    else:
+        # Final rounds: K/DST priority
+        return {'RB': 0.1, 'WR': 0.1, 'TE': 0.1, 'QB': 0.1, 'DST': 0.3, 'K': 0.3}
+
+
+def position_multipliers(run_counts, other_needs, available_counts):
+    """How much the auto-draft scales each position's round weight for what the rest of the league is doing.
+
+    A run (run_counts: picks at each position among the last run_window)
+    and other teams' unfilled spots (other_needs) compared with the players
+    left (available_counts) both make a position more urgent. Arrays are
+    per position, or (rollouts x positions).
+    """
+    runs = 1 + run_counts / run_window
+    scarcity = 1 + np.minimum(1, other_needs / np.maximum(available_counts, 1))
+    return runs * scarcity
+
+
+def rank_factor(board_rank):
+    """How strongly the auto-draft favours a player by his place on the board (1 is best)"""
+    return 1 / (board_rank + 1)
+
+
+class DraftPool:
+    """The available players as arrays, grouped into one contiguous block of columns per position.
+
+    Within a block players are ordered best first by board rank, so the
+    first available columns of a block are the auto-draft's candidates.
+    """
+
+    def __init__(self, ids, positions, values, board_ranks):
+        positions = np.asarray(positions)
+        codes = np.array([position_index.get(pos, -1) for pos in positions.tolist()])
+        keep = codes >= 0
+        order = np.lexsort((np.asarray(board_ranks, dtype=float)[keep], codes[keep]))
+        self.ids = np.asarray(ids, dtype=np.int64)[keep][order]
+        self.codes = codes[keep][order]
+        self.values = np.asarray(values, dtype=float)[keep][order]
+        self.rank_factors = rank_factor(np.asarray(board_ranks, dtype=float)[keep][order])
+        bounds = np.searchsorted(self.codes, np.arange(len(draft_positions) + 1))
+        self.blocks = [(bounds[code], bounds[code + 1]) for code in range(len(draft_positions))]
+
+
+def simulate_picks(pool, available, counts, recent, upcoming, limits, rng):
+    """Play the upcoming opponent picks in every rollout, updating the arguments in place.
+
+    available is (rollouts x players), counts is (rollouts x teams x
+    positions) roster counts with team n at index n - 1, and recent is
+    (rollouts x run_window) position codes of the latest picks, -1 for none.
+    """
+    rollouts = available.shape[0]
+    rows = np.arange(rollouts)
+    for pick, (team, current_round) in enumerate(upcoming):
+        needs = np.maximum(limits - counts, 0)
+        team_needs = needs[:, team - 1]
+        other_needs = needs.sum(axis=1) - team_needs
+        run_counts = (recent[:, :, None] == np.arange(len(draft_positions))).sum(axis=1)
+        available_counts = np.stack([available[:, start:end].sum(axis=1) for start, end in pool.blocks], axis=1)
+        multipliers = position_multipliers(run_counts, other_needs, available_counts)
+
+        position_weights = round_position_weights(current_round)
+        weights = np.zeros(available.shape)
+        fallback = np.zeros(available.shape)
+        for code, (start, end) in enumerate(pool.blocks):
+            if start == end:
+                continue
+            block = available[:, start:end]
+            ranks_in_block = np.cumsum(block, axis=1)
+            factors = pool.rank_factors[start:end] * (team_needs[:, code:code + 1] > 0)
+            weight = position_weights[draft_positions[code]] * multipliers[:, code:code + 1]
+            weights[:, start:end] = (block & (ranks_in_block <= auto_draft_candidates)) * factors * weight
+            # With nothing to pick by the round's weights, the auto-draft takes the best player at any need
+            fallback[:, start:end] = (block & (ranks_in_block == 1)) * factors
+
+        no_candidates = weights.sum(axis=1) == 0
+        weights[no_candidates] = fallback[no_candidates]
+        cumulative = np.cumsum(weights, axis=1)
+        totals = cumulative[:, -1]
+        picking = totals > 0  # A team with every position full makes no pick
+        draws = rng.random(rollouts) * totals
+        choices = np.minimum((cumulative <= draws[:, None]).sum(axis=1), available.shape[1] - 1)
+        codes = np.where(picking, pool.codes[choices], -1)
+        available[rows[picking], choices[picking]] = False
+        counts[rows[picking], team - 1, codes[picking]] += 1
+        recent[:, pick % recent.shape[1]] = codes
+
+
+def best_values(pool, available):
+    """(rollouts x positions) best value still available at each position; a position with nobody left scores its worst value"""
+    best = np.empty((available.shape[0], len(draft_positions)))
+    for code, (start, end) in enumerate(pool.blocks):
+        if start == end:
+            best[:, code] = 0.0
+            continue
+        values = pool.values[start:end]
+        best[:, code] = np.where(available[:, start:end], values, values.min()).max(axis=1)
+    return best
+
+
+def recommend(pool, my_team, position_counts, recent_picks, upcoming, roster_limits, budget_seconds=0.2,
+              batch_size=128, max_rollouts=8192, top_n=10, seed=None):
+    """Ranked recommendations for my current pick.
+
+    position_counts is the (teams x positions) roster count matrix, team n
+    in row n - 1; recent_picks the position codes of the latest real picks,
+    oldest first; upcoming the (team, round) of every pick before my next
+    one. Returns (recommendations, stats). recommendations has one row per
+    candidate at a position I still need, best first. stats holds the
+    rollouts run, the elapsed seconds and each position's drop-off.
+    """
+    start = time.perf_counter()
+    if len(pool.ids) == 0:
+        # Nothing left to pick from, e.g. ML rankings with no projections loaded
+        recommendations = pd.DataFrame({'id': pool.ids, 'pos': [], 'value': [], 'survival': [], 'dropoff': [],
+                                        'score': []})
+        return recommendations, {'rollouts': 0, 'seconds': time.perf_counter() - start,
+                                 'dropoff': dict.fromkeys(draft_positions, 0.0)}
+    rng = np.random.default_rng(seed)
+    limits = np.array([roster_limits.get(pos, 0) for pos in draft_positions])
+
+    survived = np.zeros(len(pool.ids))
+    next_best = np.zeros(len(draft_positions))
+    rollouts = 0
+    while rollouts < max_rollouts:
+        available = np.ones((batch_size, len(pool.ids)), dtype=bool)
+        counts = np.tile(position_counts, (batch_size, 1, 1))
+        # The latest real picks fill the end of the window, so the first simulated picks replace empty slots
+        # and then the oldest real ones; a run in progress carries over
+        latest = list(recent_picks)[-run_window:]
+        recent = np.full((batch_size, run_window), -1)
+        recent[:, run_window - len(latest):] = latest
+        simulate_picks(pool, available, counts, recent, upcoming, limits, rng)
+        survived += available.sum(axis=0)
+        next_best += best_values(pool, available).sum(axis=0)
+        rollouts += batch_size
+        if time.perf_counter() - start >= budget_seconds:
+            break
+
+    best_now = best_values(pool, np.ones((1, len(pool.ids)), dtype=bool))[0]
+    dropoff = best_now - next_best / rollouts
+    needed = position_counts[my_team - 1] < limits
+
+    candidates = needed[pool.codes]
+    recommendations = pd.DataFrame({
+        'id': pool.ids[candidates],
+        'pos': np.array(draft_positions)[pool.codes[candidates]],
+        'value': pool.values[candidates],
+        'survival': survived[candidates] / rollouts,
+        'dropoff': dropoff[pool.codes[candidates]],
+    })
+    recommendations['score'] = recommendations['value'] + recommendations['dropoff']
+    recommendations = recommendations.sort_values('score', ascending=False).head(top_n).reset_index(drop=True)
+    stats = {
+        'rollouts': rollouts,
+        'seconds': time.perf_counter() - start,
+        'dropoff': dict(zip(draft_positions, dropoff.tolist())),
+    }
+    return recommendations, stats
@@ -0,0 +1,199 @@
+"""Breakout and consistency flags for rushers, passers and receivers.
+
+The season files are reshaped once into a long table with one row per
+player, season and stat group (rushing, passing, receiving). Each group's
+thresholds are mapped onto its rows, so a single groupby over (group,
+player) produces the flags for every group at once.
+
+    python player_analysis.py                 # print the flags for ranked players and benchmark the analysis
+    python player_analysis.py --season 2025 --scale 20 --repeat 10
+"""
+import os
+import time
+import pandas as pd
+from expert_rankings import rankings_path, read_rankings
+from player_ids import player_id_series
+
+season_paths = {
+    'passing': os.path.join('data_used', 'historical_seasons_pass.csv'),
+    'scrimmage': os.path.join('data_used', 'historical_seasons_scrim.csv'),
+}
+
+# Per stat group: the yards a recent season must clear to flag a breakout, the yards + 6 per TD a season must clear to
+# count toward consistency, and the oldest a consistent player may be
+analysis_groups = {
+    'rushing': {'breakout_yards': 800, 'target_points': 1200, 'max_age': 30},
+    'passing': {'breakout_yards': 3000, 'target_points': 4600, 'max_age': 32},
+    'receiving': {'breakout_yards': 800, 'target_points': 1300, 'max_age': 30},
+}
+breakout_age = 25       # A breakout candidate is younger than this now
+breakout_seasons = 3    # ... and cleared the breakout yards within this many seasons
+consistency_seasons = 3  # A consistent player cleared the target in at least this many seasons
+# Stat group of a scrimmage season by position; QBs come from the passing file
+scrimmage_groups = {'RB': 'rushing', 'WR': 'receiving', 'TE': 'receiving'}
+
+
+def read_seasons(path):
+    """One row per player season from a Pro-Football-Reference season file"""
+    seasons = pd.read_csv(path)
+    seasons.columns = seasons.columns.str.strip()
+    # Rows from older scrapes with shifted columns have no Player; drop them and any stray text in stat columns
+    seasons = seasons.dropna(subset=['Season', 'Player'])
+    stats = [col for col in seasons.columns if col not in ('Team', 'Pos', 'Player')]
+    seasons[stats] = seasons[stats].apply(pd.to_numeric, errors='coerce')
+    seasons['Season'] = seasons['Season'].astype(int)
+    # Players traded mid-season have a row per team; keep the one with the most games
+    return seasons.sort_values('G', ascending=False).drop_duplicates(['Player', 'Season'])
+
+
+def load_season_table(paths=season_paths):
+    """Long table with Player, Id, Season, Age, Pos, Group, Yards and TD; one row per player, season and group"""
+    passing = read_seasons(paths['passing'])
+    scrimmage = read_seasons(paths['scrimmage'])
+    # The scrimmage file's rushing and receiving columns follow PFR's per-position layouts (rushing first for RBs,
+    # receiving first for WRs) under one header, so only the scrimmage totals line up across rows. RBs are judged as
+    # rushers and WRs/TEs as receivers on those totals.
+    skill_group = scrimmage['Pos'].map(scrimmage_groups)
+    table = pd.concat([
+        pd.DataFrame({'Player': passing['Player'], 'Season': passing['Season'], 'Age': passing['Age'],
+                      'Pos': passing['Pos'], 'Group': 'passing', 'Yards': passing['Yds'], 'TD': passing['TD']}),
+        pd.DataFrame({'Player': scrimmage['Player'], 'Season': scrimmage['Season'], 'Age': scrimmage['Age'],
+                      'Pos': scrimmage['Pos'], 'Group': skill_group, 'Yards': scrimmage['YScm'],
+                      'TD': scrimmage['RRTD']})[skill_group.notna()],
+    ], ignore_index=True)
+    table['Group'] = pd.Categorical(table['Group'], categories=list(analysis_groups))
+    table.insert(1, 'Id', player_id_series(table['Player']))
+    return table.sort_values(['Group', 'Id', 'Season'], kind='stable').reset_index(drop=True)
+
+
+def analyze_players(seasons, current_season=None, player_ids=None, groups=analysis_groups):
+    """One row per (group, player) with career totals and Breakout / Consistent flags.
+
+    current_season defaults to the season after the latest one in the table.
+    player_ids limits the analysis to those players, e.g. the ranked pool.
+    """
+    if current_season is None:
+        current_season = int(seasons['Season'].max()) + 1
+    if player_ids is not None:
+        seasons = seasons[seasons['Id'].isin(player_ids)]
+    # A season with no yards (a backup QB's, an injured player's) says nothing about either flag
+    seasons = seasons[seasons['Yards'] > 0]
+
+    # Each row picks up its group's thresholds through the category code
+    thresholds = pd.DataFrame.from_dict(groups, orient='index').reindex(seasons['Group'].cat.categories)
+    codes = seasons['Group'].cat.codes.to_numpy()
+    breakout_yards = thresholds['breakout_yards'].to_numpy()[codes]
+    target_points = thresholds['target_points'].to_numpy()[codes]
+    recent = (current_season - seasons['Season']) <= breakout_seasons
+    summary = seasons.assign(
+        Current_Age=seasons['Age'] + (current_season - seasons['Season']),
+        Breakout_Season=recent & (seasons['Yards'] > breakout_yards),
+        Target_Season=(seasons['Yards'] + seasons['TD'] * 6) > target_points,
+    ).groupby(['Group', 'Id'], observed=True, sort=False).agg(
+        Player=('Player', 'last'),
+        Pos=('Pos', 'last'),
+        Current_Age=('Current_Age', 'last'),  # Rows are in season order, so this is the latest season's
+        Seasons=('Season', 'size'),
+        Total_Yards=('Yards', 'sum'),
+        Total_TD=('TD', 'sum'),
+        Breakout_Seasons=('Breakout_Season', 'sum'),
+        Target_Seasons=('Target_Season', 'sum'),
+    ).reset_index()
+
+    max_age = thresholds['max_age'].to_numpy()[summary['Group'].cat.codes.to_numpy()]
+    summary['Breakout'] = (summary['Current_Age'] < breakout_age) & (summary['Breakout_Seasons'] > 0)
+    summary['Consistent'] = (summary['Target_Seasons'] >= consistency_seasons) & (summary['Current_Age'] <= max_age)
+    return summary
+
+
+def analyze_players_by_group(seasons, current_season=None, player_ids=None, groups=analysis_groups):
+    """Original approach, kept for benchmarking: filter and aggregate each group on its own, then stitch them together"""
+    if current_season is None:
+        current_season = int(seasons['Season'].max()) + 1
+    results = []
+    for group, settings in groups.items():
+        data = seasons[seasons['Group'] == group].copy()
+        if player_ids is not None:
+            data = data[data['Id'].isin(player_ids)]
+        data = data[data['Yards'] > 0]
+        data['Current_Age'] = data['Age'] + (current_season - data['Season'])
+        data['Breakout_Season'] = (((current_season - data['Season']) <= breakout_seasons)
+                                   & (data['Yards'] > settings['breakout_yards']))
+        data['Target_Season'] = (data['Yards'] + data['TD'] * 6) > settings['target_points']
+        summary = data.groupby('Id', sort=False).agg(
+            Player=('Player', 'last'),
+            Pos=('Pos', 'last'),
+            Current_Age=('Current_Age', 'last'),
+            Seasons=('Season', 'size'),
+            Total_Yards=('Yards', 'sum'),
+            Total_TD=('TD', 'sum'),
+            Breakout_Seasons=('Breakout_Season', 'sum'),
+            Target_Seasons=('Target_Season', 'sum'),
+        ).reset_index()
+        summary['Breakout'] = (summary['Current_Age'] < breakout_age) & (summary['Breakout_Seasons'] > 0)
+        summary['Consistent'] = ((summary['Target_Seasons'] >= consistency_seasons)
+                                 & (summary['Current_Age'] <= settings['max_age']))
+        summary.insert(0, 'Group', group)
+        results.append(summary)
+    return pd.concat(results, ignore_index=True)
+
+
+def breakout_players(summary):
+    """Breakout candidates, best recent producers first"""
+    return summary[summary['Breakout']].sort_values(['Group', 'Total_Yards'], ascending=[True, False])
+
+
+def consistent_players(summary):
+    """Consistent producers, most career yards first"""
+    return summary[summary['Consistent']].sort_values(['Group', 'Total_Yards'], ascending=[True, False])
+
+
+def scaled_season_table(seasons, scale):
+    """The season table repeated scale times as distinct players, to time the analysis on a bigger league history"""
+    copies = [seasons.assign(Id=seasons['Id'] + copy) for copy in range(scale)]
+    return pd.concat(copies, ignore_index=True).sort_values(['Group', 'Id', 'Season'], kind='stable')
+
+
+def benchmark_analysis(seasons, current_season=None, player_ids=None, repeat=5):
+    """Average ms per run of the single groupby and of the original per-group analysis on the same table"""
+    results = {}
+    for label, analyze in [('per_group', analyze_players_by_group), ('one_groupby', analyze_players)]:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            summary = analyze(seasons, current_season, player_ids)
+        results[label] = {'ms': (time.perf_counter() - start) / repeat * 1000, 'players': len(summary),
+                          'breakouts': int(summary['Breakout'].sum()),
+                          'consistent': int(summary['Consistent'].sum())}
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Flag breakout and consistent players and benchmark the analysis")
+    parser.add_argument('--season', type=int, default=None, help="season being drafted for (default: latest + 1)")
+    parser.add_argument('--all-players', action='store_true', help="analyze every player, not just the ranked ones")
+    parser.add_argument('--scale', type=int, default=1, help="repeat the season history this many times to benchmark")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    seasons = load_season_table()
+    load_ms = (time.perf_counter() - start) * 1000
+    player_ids = None if args.all_players else set(read_rankings(rankings_path)[0])
+
+    summary = analyze_players(seasons, args.season, player_ids)
+    columns = ['Player', 'Pos', 'Current_Age', 'Total_Yards', 'Total_TD']
+    for title, flagged in [('Potential breakout', breakout_players(summary)),
+                           ('Consistent', consistent_players(summary))]:
+        for group, players in flagged.groupby('Group', observed=True, sort=False):
+            print(f"\n{title} {group} players:")
+            print(players[columns].to_string(index=False))
+
+    print(f"\nLoaded {len(seasons)} player-season-group rows in {load_ms:.0f} ms")
+    benchmark_seasons = seasons if args.scale == 1 else scaled_season_table(seasons, args.scale)
+    results = benchmark_analysis(benchmark_seasons, args.season, None if args.scale > 1 else player_ids, args.repeat)
+    for label, result in results.items():
+        print(f"{label}: {result['ms']:.1f} ms | {result['players']} player groups, "
+              f"{result['breakouts']} breakouts, {result['consistent']} consistent")
+    print(f"speedup: {results['per_group']['ms'] / results['one_groupby']['ms']:.1f}x")
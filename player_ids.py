@@ -0,0 +1,56 @@
+"""Player identity shared by every data source.
+
+Rankings, projections and the historical season files spell names
+differently ("Ja'Marr Chase" / "JaMarr Chase", "Kenneth Walker III" /
+"Kenneth Walker", Pro-Football-Reference's "Jamal Agnew+" award markers).
+Each name is normalized once and hashed to a stable integer key, so joins,
+drafted checks and favorites lookups compare ints instead of re-normalizing
+strings. The key depends only on the normalized name, so it is the same in
+every file, session and process.
+"""
+import hashlib
+import re
+import unicodedata
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# Generational suffixes dropped from the end of a name
+name_suffixes = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+# Apostrophes, periods and PFR's award markers join their neighbours (Ja'Marr -> jamarr, A.J. -> aj)
+joining_punctuation = re.compile(r"[.'`*+]")
+# Any other punctuation or whitespace separates words (Valdes-Scantling -> valdes scantling)
+word_separators = re.compile(r'[^a-z0-9]+')
+
+
+@lru_cache(maxsize=None)
+def normalize_name(name):
+    """Lowercase ASCII name without punctuation, award markers or a trailing Jr./Sr./II..."""
+    text = str(name)
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
+    words = word_separators.sub(' ', joining_punctuation.sub('', text.lower())).split()
+    # Keep at least first and last name, so a surname like "V" is never dropped
+    while len(words) > 2 and words[-1] in name_suffixes:
+        words.pop()
+    return ' '.join(words)
+
+
+@lru_cache(maxsize=None)
+def player_id(name):
+    """Stable 63-bit integer key for a player name"""
+    digest = hashlib.blake2b(normalize_name(name).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') >> 1
+
+
+def player_id_series(names):
+    """player_id for a Series of names, normalizing each distinct name once. Missing names stay <NA>."""
+    codes, uniques = pd.factorize(names)
+    # The trailing slot is what missing names (code -1) pick up
+    ids = np.array([player_id(name) for name in uniques] + [0], dtype=np.int64)
+    return pd.Series(pd.arrays.IntegerArray(ids[codes], codes == -1), index=names.index, name=names.name)
+
+
+def names_by_id(names):
+    """{player_id: name} for a collection of names, e.g. a user's saved favorites"""
+    return {player_id(name): name for name in names}
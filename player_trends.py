@@ -0,0 +1,181 @@
+"""Per-player stat trends for the stat pages.
+
+Every season file is melted into one long table, one row per player,
+source, stat and season, sorted so each (player, source, stat) series is
+contiguous and in season order. Year-over-year change and the rolling
+three-season average are then computed for every series at once from
+shifted numpy arrays. Each player's rows are a contiguous block whose
+bounds are indexed by player id, so a stat page gets a player's trends
+with one dict lookup and a slice instead of recomputing them.
+
+    python player_trends.py                 # build the table and time it and per-player lookups
+"""
+import os
+import time
+import numpy as np
+import pandas as pd
+from player_analysis import read_seasons, season_paths
+from player_ids import player_id, player_id_series
+
+fantasy_path = os.path.join('data_used', 'fantasy_merged_7_17.csv')
+
+# Stats trended from each source. The scrimmage file's per-type columns follow PFR's per-position layouts, so only
+# its totals are used; fantasy_merged has the rushing/receiving split and PPR points for 2017-2022.
+trend_stats = {
+    'passing': ['G', 'Yds', 'TD', 'Int', 'Rate'],
+    'scrimmage': ['G', 'YScm', 'RRTD', 'Fmb'],
+    'fantasy': ['G', 'PPR', 'PosRk', 'PassYds', 'RushYds', 'Rec', 'RecYds'],
+}
+rolling_seasons = 3  # The rolling average covers this many seasons ending with the row's
+
+
+def read_fantasy_seasons(path=fantasy_path):
+    """One row per player season from fantasy_merged_7_17.csv, with the season file column names"""
+    seasons = pd.read_csv(path).rename(columns={'Year': 'Season', 'Tm': 'Team', 'FantPos': 'Pos',
+                                                'Yds': 'PassYds', 'TD': 'PassTD'})
+    seasons = seasons.dropna(subset=['Season', 'Player'])
+    return seasons.sort_values('G', ascending=False).drop_duplicates(['Player', 'Season'])
+
+
+def load_trend_sources(paths=season_paths, fantasy=fantasy_path):
+    """{source: season frame} for every trended source"""
+    return {
+        'passing': read_seasons(paths['passing']),
+        'scrimmage': read_seasons(paths['scrimmage']),
+        'fantasy': read_fantasy_seasons(fantasy),
+    }
+
+
+def long_season_table(sources):
+    """Id, Player, Team, Pos, Source, Stat, Season and Value rows, one per player, source, stat and season"""
+    frames = []
+    for source, seasons in sources.items():
+        stats = [stat for stat in trend_stats[source] if stat in seasons.columns]
+        frame = seasons.melt(id_vars=['Player', 'Team', 'Pos', 'Season'], value_vars=stats,
+                             var_name='Stat', value_name='Value')
+        frame['Source'] = source
+        frames.append(frame)
+    table = pd.concat(frames, ignore_index=True)
+    table['Value'] = pd.to_numeric(table['Value'], errors='coerce')
+    table['Source'] = pd.Categorical(table['Source'], categories=list(trend_stats))
+    table['Stat'] = table['Stat'].astype('category')
+    table.insert(0, 'Id', player_id_series(table['Player']).astype('int64'))
+    return table.sort_values(['Id', 'Source', 'Stat', 'Season'], kind='stable').reset_index(drop=True)
+
+
+def add_trends(table):
+    """Add Change (vs the previous season, if he played it) and Avg (mean over the last rolling_seasons seasons).
+
+    table must be sorted by series then season. Series are compared by
+    shifting whole arrays, so every series is handled in the same few
+    numpy operations; a missing value is skipped by the average.
+    """
+    ids = table['Id'].to_numpy()
+    sources = table['Source'].cat.codes.to_numpy()
+    stats = table['Stat'].cat.codes.to_numpy()
+    seasons = table['Season'].to_numpy()
+    values = table['Value'].to_numpy(dtype=float)
+
+    totals = np.nan_to_num(values)
+    counts = (~np.isnan(values)).astype(int)
+    change = np.full(len(values), np.nan)
+    for lag in range(1, rolling_seasons):
+        # Rows lag back in the same series, and within the window of seasons ending with this one
+        same_series = (ids[lag:] == ids[:-lag]) & (sources[lag:] == sources[:-lag]) & (stats[lag:] == stats[:-lag])
+        gap = seasons[lag:] - seasons[:-lag]
+        in_window = same_series & (gap < rolling_seasons)
+        earlier = values[:-lag]
+        totals[lag:] += np.where(in_window, np.nan_to_num(earlier), 0)
+        counts[lag:] += in_window & ~np.isnan(earlier)
+        if lag == 1:
+            change[1:] = np.where(same_series & (gap == 1), values[1:] - earlier, np.nan)
+
+    table['Change'] = change
+    table['Avg'] = np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+    return table
+
+
+class TrendTable:
+    """Precomputed trends for every player, sliced per player in constant time"""
+
+    def __init__(self, table):
+        self.table = table
+        ids = table['Id'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.array([], dtype=int)
+        stops = np.r_[starts[1:], len(ids)]
+        self.bounds = dict(zip(ids[starts].tolist(), zip(starts.tolist(), stops.tolist())))
+
+    def player(self, player_id_or_name):
+        """A player's trend rows (source, stat, season order), empty if he has none"""
+        key = player_id_or_name if isinstance(player_id_or_name, int) else player_id(player_id_or_name)
+        start, stop = self.bounds.get(key, (0, 0))
+        return self.table.iloc[start:stop]
+
+    def player_view(self, player_id_or_name, source):
+        """Season x (stat, Value/Change/Avg) table of one source for a player, latest season first"""
+        rows = self.player(player_id_or_name)
+        rows = rows[rows['Source'] == source]
+        if rows.empty:
+            return rows
+        view = rows.pivot(index='Season', columns='Stat', values=['Value', 'Change', 'Avg'])
+        stats = [stat for stat in trend_stats[source] if stat in view['Value'].columns]
+        view = view.swaplevel(axis=1)[[(stat, measure) for stat in stats for measure in ('Value', 'Change', 'Avg')]]
+        return view.sort_index(ascending=False)
+
+
+def build_trend_table(paths=season_paths, fantasy=fantasy_path):
+    """TrendTable built from the season files and fantasy_merged_7_17.csv"""
+    return TrendTable(add_trends(long_season_table(load_trend_sources(paths, fantasy))))
+
+
+def trends_by_groupby(table):
+    """Original approach, kept for benchmarking: grouped diff and rolling mean per series (ignores season gaps)"""
+    grouped = table.groupby(['Id', 'Source', 'Stat'], observed=True, sort=False)['Value']
+    return table.assign(Change=grouped.diff(),
+                        Avg=grouped.rolling(rolling_seasons, min_periods=1).mean().reset_index(level=[0, 1, 2],
+                                                                                                drop=True))
+
+
+def benchmark_trends(repeat=5, lookups=1000):
+    """Build time, trend computation with shifted arrays vs a grouped rolling mean, and per-player lookup time"""
+    start = time.perf_counter()
+    table = long_season_table(load_trend_sources())
+    load_ms = (time.perf_counter() - start) * 1000
+
+    results = {'load_ms': load_ms, 'rows': len(table)}
+    for label, compute in [('groupby_rolling', trends_by_groupby), ('shifted_arrays', add_trends)]:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            compute(table.copy())
+        results[f'{label}_ms'] = (time.perf_counter() - start) / repeat * 1000
+
+    trends = TrendTable(add_trends(table))
+    players = list(trends.bounds)[:lookups]
+    start = time.perf_counter()
+    for key in players:
+        trends.player(key)
+    results['lookup_us'] = (time.perf_counter() - start) / max(len(players), 1) * 1e6
+    results['players'] = len(trends.bounds)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the player trend table and time it")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--player', default=None, help="print this player's trends")
+    args = parser.parse_args()
+
+    results = benchmark_trends(args.repeat)
+    print(f"Loaded {results['rows']} stat rows for {results['players']} players in {results['load_ms']:.0f} ms")
+    print(f"trends: grouped rolling {results['groupby_rolling_ms']:.1f} ms | "
+          f"shifted arrays {results['shifted_arrays_ms']:.1f} ms")
+    print(f"per-player lookup: {results['lookup_us']:.0f} us")
+    if args.player:
+        trends = build_trend_table()
+        for source in trend_stats:
+            view = trends.player_view(args.player, source)
+            if not view.empty:
+                print(f"\n{source}:")
+                print(view.to_string())
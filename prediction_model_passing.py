@@ -1,72 +1,31 @@
+import time
 import pandas as pd
-import numpy as np
-from xgboost import XGBRegressor
-from sklearn.impute import SimpleImputer
-from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import cross_val_score, KFold
-import csv
-
-# Load data
-train_data = pd.read_csv("data_used/train2.csv")
-test_data = pd.read_csv("data_used/test2.csv")
-
-# Strip whitespace from column names
-train_data.columns = train_data.columns.str.strip()
-test_data.columns = test_data.columns.str.strip()
-
-def create_advanced_features(df):
-    df_new = df.copy()
-    # Passing efficiency metrics
-    df_new['TD_Rate'] = df_new['TD'] / df_new['Att'].replace(0, 1)
-    df_new['Int_Rate'] = df_new['Int'] / df_new['Att'].replace(0, 1)
-    df_new['Comp_Rate'] = df_new['Cmp'] / df_new['Att'].replace(0, 1)
-    df_new['YPA'] = df_new['Yds'] / df_new['Att'].replace(0, 1)
-    df_new['Points_Per_Game'] = df_new['FP'] / df_new['G'].replace(0, 1)
-    df_new['TD_Per_Game'] = df_new['TD'] / df_new['G'].replace(0, 1)
-    return df_new
-
-# Create advanced features
-train_data = create_advanced_features(train_data)
-test_data = create_advanced_features(test_data)
+from xgboost import XGBRegressor
+from feature_engineering import load_feature_frame
+from projection_model import (check_features, fit_projection, load_artifact, predict_projection, run_command_line,
+                              save_artifact, training_metadata)
+
+model_name = 'passing'
+train_path = "data_used/train2.csv"
+test_path = "data_used/test2.csv"
+predictions_path = 'data_used/flex2.csv'
+
 
 # Features for QB prediction
 features = [
-    'Age', 'G', 'GS', 'Cmp', 'Att', 'Cmp%', 
+    'Age', 'G', 'GS', 'Cmp', 'Att', 'Cmp%',
     'Yds', 'TD', 'Int', 'Y/A', 'Rate',
     'TD_Rate', 'Int_Rate', 'Comp_Rate', 'YPA',
     'Points_Per_Game', 'TD_Per_Game'
 ]
 
-# Prepare data
-X_historical = np.array(train_data[features])
-y_historical = np.array(train_data['FP'])
-
-X_recent = np.array(test_data[features])
-y_recent = np.array(test_data['FP'])
-
-# Initialize imputer and scaler
-imputer = SimpleImputer(strategy='median')
-scaler = StandardScaler()
-
-# Transform data
-X_historical = imputer.fit_transform(X_historical)
-X_recent = imputer.transform(X_recent)
-
-X_historical = scaler.fit_transform(X_historical)
-X_recent = scaler.transform(X_recent)
-
 # Combine data with weights
 weight_recent = 0.65
 weight_historical = 0.35
 
-X_combined = np.vstack([
-    X_historical * weight_historical,
-    X_recent * weight_recent
-])
-y_combined = np.concatenate([y_historical, y_recent])
-
 # Update XGBoost parameters to prevent ceiling effect
-xgb_model = XGBRegressor(
+xgb_params = dict(
     n_estimators=300,
     learning_rate=0.01,        # Reduced learning rate
     max_depth=3,               # Reduced depth
@@ -76,46 +35,80 @@ xgb_model = XGBRegressor(
     gamma=1,                   # Increased minimum loss reduction
     reg_alpha=0.5,            # Increased L1 regularization
     reg_lambda=2,             # Increased L2 regularization
+    tree_method='hist',        # Histogram splits, same as the hyperparameter search uses
     random_state=42
 )
 
-# Calculate and print CV scores
-kf = KFold(n_splits=5, shuffle=True, random_state=42)
-cv_scores = cross_val_score(xgb_model, X_combined, y_combined, cv=kf, scoring='r2')
-print("\nCross-validation R² scores:", cv_scores)
-print("Average CV R² score: %0.3f (+/- %0.3f)" % (cv_scores.mean(), cv_scores.std() * 2))
 
-# Fit model
-xgb_model.fit(X_combined, y_combined)
+def load_data(path):
+    """Read a career CSV with the engineered features (cached on disk per CSV contents)"""
+    return load_feature_frame(path, model_name)
+
+
+def train(cross_validate=False, train_data=None, test_data=None):
+    """Fit the QB model on train2/test2 and save it as a new model version"""
+    if train_data is None:
+        train_data = load_data(train_path)
+    if test_data is None:
+        test_data = load_data(test_path)
+
+    imputer, scaler, xgb_model, X_combined, y_combined = fit_projection(
+        train_data, test_data, features, xgb_params, weight_historical, weight_recent)
+
+    metadata = {}
+    if cross_validate:
+        # Calculate and print CV scores
+        kf = KFold(n_splits=5, shuffle=True, random_state=42)
+        cv_scores = cross_val_score(XGBRegressor(**xgb_params), X_combined, y_combined, cv=kf, scoring='r2')
+        print("\nCross-validation R² scores:", cv_scores)
+        print("Average CV R² score: %0.3f (+/- %0.3f)" % (cv_scores.mean(), cv_scores.std() * 2))
+        metadata['cv_r2'] = [float(score) for score in cv_scores]
+
+    # Print feature importance
+    importance_df = pd.DataFrame({
+        'Feature': features,
+        'Importance': xgb_model.feature_importances_
+    })
+    print("\nFeature Importance:")
+    print(importance_df.sort_values(by='Importance', ascending=False))
+
+    # Adjust clipping range to be more realistic for QB scoring
+    max_fp = train_data['FP'].max() * 1.1  # Allow 10% above historical maximum
+    return save_artifact(model_name, imputer, scaler, xgb_model, features, max_fp,
+                         params=xgb_params, **training_metadata(xgb_model, X_combined, y_combined, train_data,
+                                                                test_data, features), **metadata)
+
+
+def score(artifact, test_data):
+    """Predicted fantasy points for every QB in test_data, best first"""
+    # Create predictions dataframe
+    predictions_df = pd.DataFrame({
+        'Player': test_data['Player'],
+        'Predicted_FP': predict_projection(artifact, test_data),
+    })
 
-# Make predictions
-X_test = scaler.transform(np.array(test_data[features]))
+    # Sort by predicted fantasy points
+    return predictions_df.sort_values('Predicted_FP', ascending=False)
 
-# Adjust clipping range to be more realistic for QB scoring
-max_fp = train_data['FP'].max() * 1.1  # Allow 10% above historical maximum
-predictions = xgb_model.predict(X_test)
-predictions = np.clip(predictions, 0, max_fp)
 
-# Create predictions dataframe with more detail
-predictions_df = pd.DataFrame({
-    'Player': test_data['Player'],
-    'Predicted_FP': predictions,
-})
+def predict(artifact=None, version=None):
+    """Score test2 with a saved model and write the QB predictions to flex2.csv"""
+    start = time.perf_counter()
+    artifact = artifact or load_artifact(model_name, version)
+    check_features(artifact, features)
+    predictions_df = score(artifact, load_data(test_path))
 
-# Sort by predicted fantasy points
-predictions_df = predictions_df.sort_values('Predicted_FP', ascending=False)
+    # Save QB predictions to flex2.csv
+    predictions_df[['Player', 'Predicted_FP']].to_csv(predictions_path, index=False)
+    print(f"\nScored {len(predictions_df)} players with {model_name} model {artifact['version']} "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
 
-# Print feature importance
-importance_df = pd.DataFrame({
-    'Feature': features,
-    'Importance': xgb_model.feature_importances_
-})
+    print("\nPredictions:")
+    print(predictions_df)
+    return predictions_df
 
-# Save QB predictions to flex2.csv
-predictions_df[['Player', 'Predicted_FP']].to_csv('data_used/flex2.csv', index=False)
 
-print("\nFeature Importance:")
-print(importance_df.sort_values(by='Importance', ascending=False))
+if __name__ == "__main__":
+    import sys
 
-print("\nPredictions:")
-print(predictions_df)
+    run_command_line(sys.modules[__name__], "Train or run the QB fantasy points model")
@@ -1,71 +1,36 @@
+import logging
+import time
 import pandas as pd
-import numpy as np
-from sklearn.impute import SimpleImputer
-from sklearn.model_selection import cross_val_score
+from sklearn.model_selection import cross_val_score, KFold
 from xgboost import XGBRegressor
-from sklearn.metrics import mean_squared_error, r2_score
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import KFold
-import xgboost as xgb
-
-# Load data
-train_data = pd.read_csv("data_used/train.csv", sep=",")
-test_data = pd.read_csv("data_used/test.csv", sep=",")
-
-# Feature engineering - add interaction terms and normalized features
-def create_advanced_features(df):
-    df_new = df.copy()
-    # Yards per attempt
-    df_new['YPA'] = df_new['Yds'] / df_new['Att'].replace(0, 1)
-    # Yards per target
-    df_new['YPT'] = df_new['Yds'] / df_new['Tgt'].replace(0, 1)
-    # TD rate
-    df_new['TD_Rate'] = df_new['TD'] / df_new['Att'].replace(0, 1)
-    # Usage rate
-    df_new['Usage'] = (df_new['Att'] + df_new['Tgt']) / df_new['G'].replace(0, 1)
-    return df_new
-
-# Create advanced features for both datasets
-train_data = create_advanced_features(train_data)
-test_data = create_advanced_features(test_data)
+from feature_engineering import load_feature_frame
+from projection_model import (check_features, fit_projection, load_artifact, predict_projection, run_command_line,
+                              save_artifact, training_metadata)
 
-# Update features list with new features
-features = [
-    'G', 'GS', 'Att', 'Yds', 'TD',          
-    'Rec', 'YScm', 'RRTD', 'Touch',         
-    'Tgt', 'Y/R', 'YPA', 'YPT', 'TD_Rate', 'Usage'                            
-]
+logger = logging.getLogger(__name__)
 
-# Prepare historical data
-X_historical = np.array(train_data[features])
-y_historical = np.array(train_data['FP'])
+model_name = 'skilled'
+train_path = "data_used/train.csv"
+test_path = "data_used/test.csv"
+predictions_path = 'data_used/flex.csv'
 
-# Prepare recent data
-X_recent = np.array(test_data[features])
-y_recent = np.array(test_data['FP'])
 
-# Initialize imputer with median strategy instead of mean
-imputer = SimpleImputer(strategy='median')
-X_historical = imputer.fit_transform(X_historical)
-X_recent = imputer.transform(X_recent)
-
-# Normalize features to improve model stability
-scaler = StandardScaler()
-X_historical = scaler.fit_transform(X_historical)
-X_recent = scaler.transform(X_recent)
+# Update features list with new features
+features = [
+    'G', 'GS', 'Att', 'Yds', 'TD',
+    'Rec', 'YScm', 'RRTD', 'Touch',
+    'Tgt', 'Y/R', 'YPA', 'YPT', 'TD_Rate', 'Usage'
+]
 
 # Adjust weights for a more balanced approach
 weight_recent = 0.6
 weight_historical = 0.4
 
-X_combined = np.vstack([
-    X_historical * weight_historical,
-    X_recent * weight_recent
-])
-y_combined = np.concatenate([y_historical, y_recent])
+# Clip predictions to reasonable range (e.g., 0 to 400 fantasy points)
+max_fp = 400
 
 # Update XGBoost parameters to be more conservative
-xgb_model = XGBRegressor(
+xgb_params = dict(
     n_estimators=300,          # More trees for stability
     learning_rate=0.01,        # Much lower learning rate
     max_depth=3,               # Reduced depth to prevent overfitting
@@ -75,60 +40,87 @@ xgb_model = XGBRegressor(
     gamma=2,                   # Increased minimum loss reduction
     reg_alpha=0.5,            # Increased L1 regularization
     reg_lambda=2,             # Increased L2 regularization
+    tree_method='hist',        # Histogram splits, same as the hyperparameter search uses
     random_state=42
 )
 
-# Use KFold instead of default CV for more stable results
-kf = KFold(n_splits=5, shuffle=True, random_state=42)
-cv_scores = cross_val_score(xgb_model, X_combined, y_combined, cv=kf, scoring='r2')
-
-# Calculate and print CV scores
-print("\nCross-validation R² scores:", cv_scores)
-print("Average CV R² score: %0.3f (+/- %0.3f)" % (cv_scores.mean(), cv_scores.std() * 2))
-
-# Create evaluation set
-eval_set = [(X_combined, y_combined)]
-
-# Fit model with proper early stopping syntax for older XGBoost versions
-xgb_model.fit(
-    X_combined, 
-    y_combined,
-    eval_set=eval_set,
-    verbose=False
-)
-
-# Scale test data before prediction
-X_test = scaler.transform(np.array(test_data[features]))
-predictions = xgb_model.predict(X_test)
-
-# Clip predictions to reasonable range (e.g., 0 to 400 fantasy points)
-predictions = np.clip(predictions, 0, 400)
-
-# Create predictions DataFrame
-predictions_df = pd.DataFrame({
-    'Player': test_data['Player'],
-    'Predicted_FP': predictions
-})
-
-# Check for duplicates and keep only first occurrence
-duplicate_players = predictions_df['Player'].duplicated(keep='first')
-if duplicate_players.any():
-    print("\nRemoving duplicate entries for players:")
-    print(predictions_df[duplicate_players]['Player'].unique())
-    predictions_df = predictions_df[~predictions_df['Player'].duplicated(keep='first')]
-
-# Feature importance
-importance_df = pd.DataFrame({
-    'Feature': features,
-    'Importance': xgb_model.feature_importances_
-})
-
-# Save skilled position predictions to flex.csv
-predictions_df[['Player', 'Predicted_FP']].to_csv('data_used/flex.csv', index=False)
-
-print("\nFeature Importance:")
-print(importance_df.sort_values(by='Importance', ascending=False))
-
-print("\nPredictions:")
-print(predictions_df)
 
+def load_data(path):
+    """Read a career CSV with the engineered features (cached on disk per CSV contents)"""
+    return load_feature_frame(path, model_name)
+
+
+def train(cross_validate=False, train_data=None, test_data=None):
+    """Fit the RB/WR/TE model on train/test and save it as a new model version"""
+    if train_data is None:
+        train_data = load_data(train_path)
+    if test_data is None:
+        test_data = load_data(test_path)
+
+    imputer, scaler, xgb_model, X_combined, y_combined = fit_projection(
+        train_data, test_data, features, xgb_params, weight_historical, weight_recent)
+
+    metadata = {}
+    if cross_validate:
+        # Use KFold instead of default CV for more stable results
+        kf = KFold(n_splits=5, shuffle=True, random_state=42)
+        cv_scores = cross_val_score(XGBRegressor(**xgb_params), X_combined, y_combined, cv=kf, scoring='r2')
+        print("\nCross-validation R² scores:", cv_scores)
+        print("Average CV R² score: %0.3f (+/- %0.3f)" % (cv_scores.mean(), cv_scores.std() * 2))
+        metadata['cv_r2'] = [float(score) for score in cv_scores]
+
+    # Feature importance
+    importance_df = pd.DataFrame({
+        'Feature': features,
+        'Importance': xgb_model.feature_importances_
+    })
+    print("\nFeature Importance:")
+    print(importance_df.sort_values(by='Importance', ascending=False))
+
+    return save_artifact(model_name, imputer, scaler, xgb_model, features, max_fp,
+                         params=xgb_params, **training_metadata(xgb_model, X_combined, y_combined, train_data,
+                                                                test_data, features), **metadata)
+
+
+def score(artifact, test_data):
+    """Predicted fantasy points for every player in test_data, one row per player"""
+    # Create predictions DataFrame
+    predictions_df = pd.DataFrame({
+        'Player': test_data['Player'],
+        'Predicted_FP': predict_projection(artifact, test_data)
+    })
+
+    # Check for duplicates and keep only first occurrence
+    duplicate_players = predictions_df['Player'].duplicated(keep='first')
+    if duplicate_players.any():
+        logger.debug("Removing duplicate entries for players: %s",
+                     list(predictions_df[duplicate_players]['Player'].unique()))
+        predictions_df = predictions_df[~duplicate_players]
+    return predictions_df
+
+
+def predict(artifact=None, version=None):
+    """Score test with a saved model and write the skilled position predictions to flex.csv"""
+    start = time.perf_counter()
+    artifact = artifact or load_artifact(model_name, version)
+    check_features(artifact, features)
+    test_data = load_data(test_path)
+    predictions_df = score(artifact, test_data)
+    duplicates = test_data['Player'][test_data['Player'].duplicated()].unique()
+    if len(duplicates):
+        print(f"\nRemoved duplicate entries for players: {list(duplicates)}")
+
+    # Save skilled position predictions to flex.csv
+    predictions_df[['Player', 'Predicted_FP']].to_csv(predictions_path, index=False)
+    print(f"\nScored {len(predictions_df)} players with {model_name} model {artifact['version']} "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    print("\nPredictions:")
+    print(predictions_df)
+    return predictions_df
+
+
+if __name__ == "__main__":
+    import sys
+
+    run_command_line(sys.modules[__name__], "Train or run the RB/WR/TE fantasy points model")
@@ -1,446 +1,651 @@
-import requests
 from bs4 import BeautifulSoup
+import argparse
 import re
 import csv
 import re
 import pandas as pd
 import time
+import os
+import sys
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from scrape_fetch import CircuitBreaker, Fetcher, FetchError
+from scrape_metrics import ScrapeMetrics
+from stat_table_parser import (parse_player_page, passing_table_ids, passing_stat_mapping,
+                               scrimmage_table_ids, scrimmage_stat_mapping)
 
 rootURL = 'https://www.pro-football-reference.com'
-playerURL_list = []
-player_list = []
-qb_list = []
-qb_url_list = []
 
-url = 'https://www.pro-football-reference.com/years/2024/scrimmage.htm'   #for skilled positions players
+# Seasons whose player lists are scraped. Each player's career page holds every
+# season, so a player listed in several seasons is still only fetched once.
+first_season = 2024
+last_season = 2024
 
-url2 = 'https://www.pro-football-reference.com/years/2024/passing.htm'     #for quarterbacks
+# Season list pages: 'scrimmage' for skilled positions players, 'passing' for quarterbacks
+season_list_path = '/years/{season}/{page}.htm'
 
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'}
 
+# Pipeline tuning
+request_delay = 10          # Seconds between page requests; grows automatically when the server pushes back
+fetch_workers = 2           # Threads downloading pages, all paced by one circuit breaker
+parse_workers = 4           # Processes used to parse pages
+queue_size = 8              # Max pages/results waiting between stages
+write_batch_size = 200      # Season rows buffered before the writer flushes to disk
+output_dir = 'data_used'    # Where the CSVs the models and app read are written
+metrics_file_name = 'scrape_metrics.jsonl'  # Per-player timings are appended here after each run
+
+# Exit codes for scheduled runs: anything but 0 should alert
+exit_ok = 0                 # Every page was fetched and written (or there was nothing new)
+exit_partial = 3            # Some pages failed to fetch or parse; everything else was written
+exit_failed = 4             # No player list or no player page could be fetched
+
+# Column schemas for the passing outputs, used when a file has no header yet
+passing_season_columns = ['Season', 'Age', 'Team', 'Pos', 'G', 'GS', 'Cmp', 'Att', 'Cmp%', 'Yds', 'TD', 'TD%',
+                          'Int', 'Int%', '1D', 'Succ%', 'Lng', 'Y/A', 'AY/A', 'Y/C', 'Y/G', 'Rate', 'QBR', 'Sk',
+                          'Yds_sack', 'Sk%', 'NY/A', 'ANY/A', '4QC', 'GWD', 'Player']
+passing_career_columns = ['Player', 'Age', 'Team', 'Pos', 'G', 'GS', 'Cmp', 'Att', 'Cmp%', 'Yds', 'TD', 'TD%',
+                          'Int', 'Int%', '1D', 'Succ%', 'Lng', 'Y/A', 'AY/A', 'Y/C', 'Y/G', 'Rate', 'QBR', 'Sk',
+                          'Yds_sack', 'Sk%', 'NY/A', 'ANY/A', '4QC', 'GWD', 'FP']
+scrimmage_season_columns = ['Season', 'Age', 'Team', 'Pos', 'G', 'GS', 'Att', 'Yds', 'TD', '1D', 'Succ%', 'Lng',
+                            'Y/A', 'Y/G', 'A/G', 'Tgt', 'Rec', 'Y/R', 'R/G', 'Ctch%', 'Y/Tgt', 'Touch', 'Y/Tch',
+                            'YScm', 'RRTD', 'Fmb', 'Player']
+scrimmage_career_columns = ['Player', 'Age', 'Team', 'Pos', 'G', 'GS', 'Att', 'Yds', 'TD', 'Rec', 'Tgt', 'Y/R',
+                            'Touch', 'YScm', 'RRTD', 'Fmb', 'FP']
+
+# The app reads this file's column names with a leading space (' Pos', ' G', ...)
+header_separators = {'historical_seasons_scrim.csv': ', '}
+
+# File names each table's season rows and career summaries are written to
+scrape_files = {
+    'passing': ('historical_seasons_pass.csv', 'train2.csv', passing_season_columns, passing_career_columns),
+    'scrimmage': ('historical_seasons_scrim.csv', 'train.csv', scrimmage_season_columns, scrimmage_career_columns),
+}
+
+
+def scrape_outputs(directory=output_dir, tables=None):
+    """{table: (seasons_path, career_path, season_columns, career_columns)} for files under directory"""
+    return {
+        table: (os.path.join(directory, seasons_file), os.path.join(directory, career_file),
+                season_columns, career_columns)
+        for table, (seasons_file, career_file, season_columns, career_columns) in scrape_files.items()
+        if tables is None or table in tables
+    }
+
+
+def coerce_numeric(final_df, numeric_columns):
+    """Convert every stat column to numbers in one call"""
+    present = [col for col in numeric_columns if col in final_df.columns]
+    for col in numeric_columns:
+        if col not in final_df.columns:
+            print(f"Column '{col}' does not exist in final_df.")
+    if present:
+        final_df[present] = final_df[present].apply(pd.to_numeric, errors='coerce')
+    return final_df
+
+
+def build_passing_frames(all_years_data, player_name):
+    """Turn parsed passing table rows into numeric season rows"""
+    # Create DataFrame from all collected data
+    final_df = pd.DataFrame(all_years_data)
+
+    # Drop rows where all columns are NA
+    final_df = final_df.dropna(how='all')
+
+    # Filter out summary rows by requiring Age, Team, or Lg to have a value
+    final_df = final_df[final_df[['Age', 'Team']].notna().any(axis=1)]
+
+    # Drop the header row
+    final_df = final_df.drop(index=0, errors='ignore').reset_index(drop=True)
+    # Check if 'QBrec' and 'Awards' exist in the DataFrame before dropping
+    columns_to_drop = ["Awards", "QBrec"]
+    final_df = final_df.drop(columns=[col for col in columns_to_drop if col in final_df.columns])
+    final_df['Player'] = player_name
+
+    final_df = coerce_numeric(final_df, passing_summary_columns)
+
+    # Drop rows where all columns are NA
+    return final_df.dropna(how='all')
+
+
+def build_scrimmage_frames(all_years_data, player_name):
+    """Turn parsed rushing/receiving table rows into numeric season rows"""
+    rows = []
+    for formatted_row in all_years_data:
+        # Remove any award text that might be in the value
+        for col, value in formatted_row.items():
+            if value and any(award in value for award in ['AP', 'PB', 'AP1', 'AP2']):
+                formatted_row[col] = value.split(' ')[0]  # Take only the first part before any award text
+        # Only add rows that are not repeated header rows
+        if not all(v in scrimmage_stat_mapping.values() for v in formatted_row.values()):
+            rows.append(formatted_row)
+
+    # Create DataFrame from all collected data
+    final_df = pd.DataFrame(rows)
+
+    # Drop rows where all columns are NA
+    final_df = final_df.dropna(how='all')
+
+    # Filter out summary rows by requiring Age, Team, or Lg to have a value
+    final_df = final_df[final_df[[col for col in ['Age', 'Team', 'Lg'] if col in final_df.columns]].notna().any(axis=1)]
+
+    # Drop the header row
+    final_df = final_df.drop(index=0, errors='ignore').reset_index(drop=True)
+    # Check if 'AV' and 'Lg' exist in the DataFrame before dropping
+    columns_to_drop = ["AV", "Lg"]
+    final_df = final_df.drop(columns=[col for col in columns_to_drop if col in final_df.columns])
+    final_df['Player'] = player_name
+
+    final_df = coerce_numeric(final_df, scrimmage_summary_columns)
+
+    # Drop rows where all columns are NA
+    return final_df.dropna(how='all')
+
+
+# Stats averaged into each player's career row
+passing_summary_columns = [
+    'G', 'GS', 'Cmp', 'Att', 'Cmp%', 'Yds', 'TD', 'TD%', 'Int', 'Int%',
+    '1D', 'Succ%', 'Lng', 'Y/A', 'AY/A', 'Y/C', 'Y/G', 'Rate',
+    'QBR', 'Sk', 'Yds_sack', 'Sk%', 'NY/A', 'ANY/A', '4QC', 'GWD'
+]
+scrimmage_summary_columns = [
+    'G', 'GS', 'Att', 'Yds', 'TD', 'Rec', 'Y/R', 'Tgt', 'Touch', 'YScm', 'RRTD', 'Fmb'
+]
+
+
+def passing_fantasy_points(career):
+    return (career['Yds'] * 0.04) + (career['TD'] * 6) - (career['Int'] * 2)
+
+
+def scrimmage_fantasy_points(career):
+    return (career['YScm'] * 0.1) + (career['Rec'] * 1) + (career['RRTD'] * 6) + (career['Fmb'] * -2)
+
+
+# Table ids, data-stat mapping, season row builder, career stats and fantasy points for each stats table
+player_tables = {
+    'passing': (passing_table_ids, passing_stat_mapping, build_passing_frames,
+                passing_summary_columns, passing_fantasy_points),
+    'scrimmage': (scrimmage_table_ids, scrimmage_stat_mapping, build_scrimmage_frames,
+                  scrimmage_summary_columns, scrimmage_fantasy_points),
+}
+
+
+def summarize_careers(seasons, columns_to_summarize, fantasy_points):
+    """Career averages for every player in a batch of season rows, in one groupby.
+
+    seasons holds many players' rows tagged with their player_url, so two
+    players who share a name are still summarized separately.
+    """
+    # Player, Age, Team, Pos come from each player's most recent season row
+    career = seasons.drop_duplicates('player_url', keep='last').set_index('player_url').reindex(
+        columns=['Player', 'Age', 'Team', 'Pos'])
+
+    present = [col for col in columns_to_summarize if col in seasons.columns]
+    career = career.join(seasons.groupby('player_url', sort=False)[present].mean())
+    # Stats missing from every page in the batch stay empty
+    career = career.reindex(columns=['Player', 'Age', 'Team', 'Pos'] + columns_to_summarize)
+
+    career['FP'] = fantasy_points(career)
+    return career.reset_index(drop=True)
+
+
+def parse_player_tables(html, player_name, tables):
+    """Extract every requested stats table from one fetched player page.
+
+    Runs in a worker process, so it only takes and returns picklable values.
+    Returns {table: season rows} for the tables found on the page.
+    """
+    results = {}
+    for table in tables:
+        table_ids, data_stat_mapping, build_frames = player_tables[table][:3]
+        all_years_data = parse_player_page(html, table_ids, data_stat_mapping)
+        if all_years_data is not None:
+            results[table] = build_frames(all_years_data, player_name)
+    return results
+
+
+def fetch_stage(jobs, fetch_queue, fetcher, metrics, workers, root_url=rootURL):
+    """Download player pages with a few threads and hand the raw HTML to the parse stage.
+
+    The fetcher's circuit breaker paces every thread together, so more threads
+    overlap slow responses without sending requests any faster than allowed.
+    """
+    job_queue = queue.Queue()
+    for counter, job in enumerate(jobs):
+        job_queue.put((counter, job))
+
+    def fetch_worker():
+        while True:
+            try:
+                counter, (player_name, player_url, tables) = job_queue.get_nowait()
+            except queue.Empty:
+                return
+            print(f"Processing Player: {player_url} | Amount left to process: {len(jobs) - counter - 1}")
+            metrics.record(player_url, player=player_name)
 
-#for quarterbacks
-
-print("Clear existing Data ? Y/N")
-clear_data = input()
-if clear_data == "Y":
-    clear_data = True
-else:
-    clear_data = False
-#data cleaning for testing qb data
-if clear_data == True:
-    # Initialize the files with headers
-    with open('data_used/train2.csv', 'w') as f:
-        f.write('Player,Age,Team,Pos,G,GS,Cmp,Att,Cmp%,Yds,TD,TD%,Int,Int%,1D,Succ%,Lng,Y/A,AY/A,Y/C,Y/G,Rate,QBR,Sk,Yds_sack,Sk%,NY/A,ANY/A,4QC,GWD,FP\n')
-    open('data_used/historical_seasons_pass.csv', 'w').close()
-
-res2 = requests.get(url2, headers=headers)
-print("Response Status Code:", res2.status_code)  # Check if the request was successful
-
-soup2 = BeautifulSoup(res2.text,features="html.parser")
-
-# Find all 'td' elements with the relevant class
-for td in soup2.find_all('td', class_='left'):
-    a_tag2 = td.find('a')
-    if a_tag2:
-        qb_list.append(a_tag2.text)  # Get player name
-        qb_url_list.append(a_tag2['href'])  # Get player URL
-
-# Output the results
-
-qb_names = [name for name in qb_list if name not in [
-    'PB','PHI', 'BAL', 'DET', 'ATL', 'CIN', 'GNB', 'IND', 'MIN', 'TAM', 'ARI', 
-    'MIA', 'NOR', 'LAR', 'NYJ', 'CHI', 'JAX', 'DAL', 'PIT', 'HOU', 'TEN', 
-    'SFO', 'WAS', 'NWE', 'LVR', 'KAN', 'BUF', 'DEN', 'SEA', 'LAC', 'CAR', 
-    'NYG', 'CLE'] and not any(char.isdigit() for char in name)]
-
-# Filter out any remaining entries that start with award designations
-qb_names = [name for name in qb_names if not any(name.startswith(prefix) for prefix in ['AP', 'SB', 'MVP', 'ORoY', 'OPoY', 'CPoY'])]
-
-#print("Player Names:", qb_names)
-qb_urls = [i for i in qb_url_list if i.startswith('/players/')]
-#print("Player URLs:", qb_urls)
-
-
-
-
-counter2=0
-df = pd.read_csv('data_used/train2.csv')
-names_df = df[['Player']].dropna().reset_index(drop=True)
-
-
-for qb_url in qb_urls:
-    print(f"Current counter: {counter2}, Processing Player: {qb_url}")
-    
-    if qb_names[counter2] in names_df['Player'].values:
-        print(f"Player {qb_url} already exists in the dataset. Skipping...")
-        counter2 += 1
-        continue
-    else:
-        print(f"Processing Player: {qb_url} | Amount left to process: {len(qb_urls) - counter2 - 1}")
-        time.sleep(10)
-
-        res2 = requests.get(rootURL + qb_url, headers=headers)
-        if res2.status_code != 200:
-            print(f"Failed to retrieve data for {qb_url}. Status code: {res2.status_code}")
-            counter2 += 1
-            continue
-
-        # Reset final_df for the new player
-        all_years_data = []
-        final_df = pd.DataFrame()  # Reset DataFrame for new player
-
-        soup2 = BeautifulSoup(res2.text, features="html.parser")
-        # Find the table with rushing and receiving stats
-        stats_table = soup2.find('table', id='passing') 
-        if stats_table:
-            # Get all rows from the table
-            passing = stats_table.find_all('tr')  
-            print("Number of rows found:", len(passing))
-        else:
-            print(f"No stats table found for {qb_url}. Skipping...")
-            counter2 += 1
-            continue  # Skip to the next player if no table is found
-
-        data_stat_mapping = {
-        'year_id': 'Season',               # Year of the data
-        'age': 'Age',                       # Player's age
-        'team_name_abbr': 'Team',          # Team abbreviation
-        'pos': 'Pos',                       # Position (QB)
-        'games': 'G',                       # Games played
-        'games_started': 'GS',              # Games started
-        'qb_rec': 'QBrec',                 # Quarterback record (wins-losses-ties)
-        'pass_cmp': 'Cmp',                 # Completions
-        'pass_att': 'Att',                 # Attempts
-        'pass_cmp_pct': 'Cmp%',             # Completion percentage
-        'pass_yds': 'Yds',                 # Passing yards
-        'pass_td': 'TD',                   # Touchdowns
-        'pass_td_pct': 'TD%',               # Touchdown percentage
-        'pass_int': 'Int',                 # Interceptions
-        'pass_int_pct': 'Int%',             # Interception percentage
-        'pass_first_down': '1D',           # First downs
-        'pass_success': 'Succ%',            # Success percentage
-        'pass_long': 'Lng',                 # Longest pass
-        'pass_yds_per_att': 'Y/A',         # Yards per attempt
-        'pass_adj_yds_per_att': 'ANY/A',   # Adjusted net yards per attempt
-        'pass_yds_per_cmp': 'Y/C',         # Yards per completion
-        'pass_yds_per_g': 'Y/G',           # Yards per game
-        'pass_rating': 'Rate',              # Passer rating
-        'qbr': 'QBR',                      # Quarterback rating
-        'pass_sacked': 'Sk',               # Sacks
-        'pass_sacked_yds': 'Yds_sack',          # Yards lost to sacks
-        'pass_sacked_pct': 'Sk%',          # Sack percentage
-        'pass_net_yds_per_att': 'NY/A',    # Net yards per attempt
-        'pass_adj_net_yds_per_att': 'ANY/A', # Adjusted net yards per attempt
-        'comebacks': '4QC',                # Comebacks led
-        'gwd': 'GWD',                      # Game-winning drives
-        'av': 'AV',                        # Approximate Value
-        'awards': 'Awards'                 # Awards received
-        }
-
-        
-        
-        
-        # Format the data to match the headers and create a DataFrame for each year
-        for row in passing:
-            # Create a dictionary for this row's data
-            formatted_row = {}
-    
-            # Loop through all td elements in the row
-            for td in row.find_all(['td', 'th']):
-                stat_name = td.get('data-stat')
-                if stat_name in data_stat_mapping:
-                    value = td.get_text(strip=True)
-                    formatted_row[data_stat_mapping[stat_name]] = value
-    
-            # Only add rows that have data
-            if formatted_row:  # Only append if the dictionary is not empty
-                all_years_data.append(formatted_row)
-
-        # Create DataFrame from all collected data
-        final_df = pd.DataFrame()  # Reset DataFrame for new player
-        final_df = pd.DataFrame(all_years_data)
-
-        # Drop rows where all columns are NA
-        final_df = final_df.dropna(how='all')
-
-        # Filter out summary rows by requiring Age, Team, or Lg to have a value
-        final_df = final_df[final_df[['Age', 'Team']].notna().any(axis=1)]
-
-        # Assuming 'df' is your DataFrame
-        final_df = final_df.drop(index=0).reset_index(drop=True)
-        # Check if 'QBrec' and 'Awards' exist in the DataFrame before dropping
-        columns_to_drop = ["Awards", "QBrec"]
-        final_df = final_df.drop(columns=[col for col in columns_to_drop if col in final_df.columns], axis=1)
-        final_df['Player'] = qb_names[counter2]
-
-        
-
-        
-        # Check the columns in final_df
-        #print("Columns in final_df:", final_df.columns)
-
-        # Update numeric conversion with a safe access method
-        numeric_columns = ["G","GS","Cmp","Att","Cmp%","Yds","TD","TD%","Int","Int%","1D","Succ%","Lng","Y/A","AY/A","Y/C","Y/G","Rate","QBR","Sk","Yds_sack","Sk%","NY/A","ANY/A","4QC","GWD"]
-        for col in numeric_columns:
-            if col in final_df.columns:
-                final_df[col] = pd.to_numeric(final_df[col], errors='coerce')
-            else:
-                print(f"Column '{col}' does not exist in final_df.")
-
-        # Drop rows where all columns are NA
-        final_df = final_df.dropna(how='all')
-        # Summarize career statistics
-        columns_to_summarize = [
-            'G', 'GS', 'Cmp', 'Att', 'Cmp%', 'Yds', 'TD', 'TD%', 'Int', 'Int%', 
-            '1D', 'Succ%', 'Lng', 'Y/A', 'AY/A', 'Y/C', 'Y/G', 'Rate', 
-            'QBR', 'Sk', 'Yds_sack', 'Sk%', 'NY/A', 'ANY/A', '4QC', 'GWD'
-        ]
-        print(final_df.head)
-        final_df.to_csv("data_used/historical_seasons_pass.csv",mode='a',header=False,index=False)
-        # Initialize career_stats with the first row for Season, Age, Team, Pos
-        if len(final_df) > 0:
-            career_stats = final_df[['Player', 'Age', 'Team', 'Pos']].iloc[len(final_df)-1]
-            
-            # Loop through the columns and calculate the mean if the column exists
-            for col in columns_to_summarize:
-                if col in final_df.columns:
-                    career_stats[col] = final_df[col].mean()  # Calculate mean
-                else:
-                    career_stats[col] = None  # Set to None if the column does not exist
-
-            career_stats['FP'] = (career_stats['Yds'] * 0.04)+(career_stats['TD']*6)-(career_stats['Int']*2)
-
-            # Convert the Series to a DataFrame
-            career_stats_df = pd.DataFrame(career_stats).T
-            career_stats_df.to_csv('data_used/train2.csv', mode='a',header=False,index=False)
-        else:
-            print(f"No valid data found for player {qb_names[counter2]}, skipping...")
-        
-        counter2 += 1  # Ensure this is executed at the end of processing
-
-
-
-"""""
-#for rushing and recieving
-
-
-
-
-## Scrape for table data
-res = requests.get(url, headers=headers)
-print("Response Status Code:", res.status_code)  # Check if the request was successful
-
-soup = BeautifulSoup(res.text,features="html.parser")
-
-# Find all 'td' elements with the relevant class
-for td in soup.find_all('td', class_='left'):
-    a_tag = td.find('a')
-    if a_tag:
-        player_list.append(a_tag.text)  # Get player name
-        playerURL_list.append(a_tag['href'])  # Get player URL
-
-# Output the results
-player_names = [name for name in player_list if name not in [
-    'PB','PHI', 'BAL', 'DET', 'ATL', 'CIN', 'GNB', 'IND', 'MIN', 'TAM', 'ARI', 
-    'MIA', 'NOR', 'LAR', 'NYJ', 'CHI', 'JAX', 'DAL', 'PIT', 'HOU', 'TEN', 
-    'SFO', 'WAS', 'NWE', 'LVR', 'KAN', 'BUF', 'DEN', 'SEA', 'LAC', 'CAR', 
-    'NYG', 'CLE'] and not any(char.isdigit() for char in name)]
-
-# Filter out any remaining entries that start with award designations
-player_names = [name for name in player_names if not any(name.startswith(prefix) for prefix in ['AP', 'SB', 'MVP', 'ORoY', 'OPoY', 'CPoY'])]
-
-#print("Player Names:", player_names)
-player_urls = [i for i in playerURL_list if i.startswith('/players/')]
-#print("Player URLs:", player_urls)
-
-
-counter=0
-df = pd.read_csv('data_used/train.csv')
-names_df = df[['Player']].dropna().reset_index(drop=True)
-
-
-for player_url in player_urls:
-    print(f"Current counter: {counter}, Processing Player: {player_url}")
-    
-    if player_names[counter] in names_df['Player'].values:
-        print(f"Player {player_url} already exists in the dataset. Skipping...")
-        counter += 1
-        continue
-    else:
-        print(f"Processing Player: {player_url} | Amount left to process: {len(player_urls) - counter - 1}")
-        time.sleep(10)
-
-        res2 = requests.get(rootURL + player_url, headers=headers)
-        if res2.status_code != 200:
-            print(f"Failed to retrieve data for {player_url}. Status code: {res2.status_code}")
-            counter += 1
-            continue
-
-        # Reset final_df for the new player
-        all_years_data = []
-        
-        final_df = pd.DataFrame()  # Reset DataFrame for new player
-        
-
-        soup2 = BeautifulSoup(res2.text, features="html.parser")
-
-        # Find the table with rushing and receiving stats
-        stats_table = soup2.find('table', id='receiving_and_rushing') or soup2.find('table', id='rushing_and_receiving')
-        if stats_table:
-            # Get all rows from the table
-            rushing_receiving = stats_table.find_all('tr')  
-            print("Number of rows found:", len(rushing_receiving))
-        else:
-            print(f"No stats table found for {player_url}. Skipping...")
-            counter += 1
-            continue  # Skip to the next player if no table is found
-
-        # Define the mapping from data-stat to desired column names
-        data_stat_mapping = {
-            'year_id': 'Season',
-            'age': 'Age',
-            'team_name_abbr': 'Team',
-            'comp_name_abbr': 'Lg',
-            'pos': 'Pos',
-            'games': 'G',
-            'games_started': 'GS',
-            'rush_att': 'Att',
-            'rush_yds': 'Yds',
-            'rush_td': 'TD',
-            'rush_first_down': '1D',
-            'rush_success': 'Succ%',
-            'rush_long': 'Lng',
-            'rush_yds_per_att': 'Y/A',
-            'rush_yds_per_g': 'Y/G',
-            'rush_att_per_g': 'A/G',
-            'targets': 'Tgt',
-            'rec': 'Rec',
-            'rec_yds': 'Yds',
-            'rec_yds_per_rec': 'Y/R',
-            'rec_td': 'TD',  # Note: This is repeated
-            'rec_first_down': '1D',  # Note: This is repeated
-            'rec_success': 'Succ%',
-            'rec_long': 'Lng',
-            'rec_per_g': 'R/G',
-            'rec_yds_per_g': 'Y/G',
-            'catch_pct': 'Ctch%',
-            'rec_yds_per_tgt': 'Y/Tgt',
-            'touches': 'Touch',
-            'yds_per_touch': 'Y/Tch',
-            'yds_from_scrimmage': 'YScm',
-            'rush_receive_td': 'RRTD',
-            'fumbles': 'Fmb',
-            'av': 'AV',
-        }
-
-        # Format the data to match the headers and create a DataFrame for each year
-        for row in rushing_receiving:
-            # Skip header rows
-            if row.get('class') and 'thead' in row.get('class'):
+            try:
+                res = fetcher.get(root_url + player_url, metrics, player_url)
+            except FetchError as e:
+                metrics.record(player_url, status=e.status, error=str(e))
+                print(f"Failed to retrieve data for {player_url}. {e}")
                 continue
-            
-            # Create a dictionary for this row's data
-            formatted_row = {}
-            
-            # Loop through all td elements in the row
-            for td in row.find_all(['td', 'th']):
-                stat_name = td.get('data-stat')
-                
-                # Skip any award-related data stats
-                if stat_name in ['awards', 'player-additional']:
-                    continue
-                    
-                if stat_name in data_stat_mapping:
-                    value = td.get_text(strip=True)
-                    # Remove any award text that might be in the value
-                    if value and any(award in value for award in ['AP', 'PB', 'AP1', 'AP2']):
-                        value = value.split(' ')[0]  # Take only the first part before any award text
-                    formatted_row[data_stat_mapping[stat_name]] = value
-
-            # Only add rows that have data and are not header rows
-            if formatted_row and not all(v in data_stat_mapping.values() for v in formatted_row.values()):
-                all_years_data.append(formatted_row)
-
-        # Create DataFrame from all collected data
-        
-        final_df = pd.DataFrame()  # Reset DataFrame for new player
-        final_df = pd.DataFrame(all_years_data)
-        
-
-        # Drop rows where all columns are NA
-        final_df = final_df.dropna(how='all')
-
-        # Filter out summary rows by requiring Age, Team, or Lg to have a value
-        final_df = final_df[final_df[['Age', 'Team', 'Lg']].notna().any(axis=1)]
-        
-    
-
-        # Assuming 'df' is your DataFrame
-        final_df = final_df.drop(index=0).reset_index(drop=True)
-        # Check if 'AV' exists in the DataFrame before dropping
-        if 'AV' in final_df.columns:
-            final_df = final_df.drop([ "AV", "Lg"], axis=1)
-        else:
-            final_df = final_df.drop([ "Lg"], axis=1)  # Drop only the columns that exist
-        final_df['Player'] = player_names[counter]
-        
-        
-
-        # Check the columns in final_df
-        #print("Columns in final_df:", final_df.columns)
-
-        # Update numeric conversion with a safe access method
-        numeric_columns = ['G', 'GS', 'Att', 'Yds', 'TD', 'Rec', 'Y/R', 'Tgt', 'Touch', 'YScm', 'RRTD', 'Fmb']
-        for col in numeric_columns:
-            if col in final_df.columns:
-                final_df[col] = pd.to_numeric(final_df[col], errors='coerce')
+            metrics.record(player_url, status=res.status_code, bytes=len(res.content))
+            # Blocks when the parse stage is behind, so memory stays bounded
+            fetch_queue.put((player_name, player_url, tables, res.text))
+
+    threads = [threading.Thread(target=fetch_worker, daemon=True) for _ in range(workers)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        # Always tell the parse stage we are done, even if fetching failed
+        fetch_queue.put(None)
+
+
+def timed_parse(parse_func, html, player_name, tables):
+    """Run a parse job in a worker and report how long the parse itself took"""
+    start = time.perf_counter()
+    result = parse_func(html, player_name, tables)
+    return result, time.perf_counter() - start
+
+
+def forward_result(pending_item, write_queue, metrics):
+    """Wait for one parse job and pass its frames on to the writer"""
+    player_name, player_url, future = pending_item
+    try:
+        result, parse_seconds = future.result()
+    except Exception as e:
+        metrics.record(player_url, error=f"parse: {e}")
+        print(f"Error parsing {player_url}: {e}")
+        return
+    metrics.record(player_url, parse_seconds=parse_seconds)
+    if not result:
+        print(f"No stats table found for {player_url}. Skipping...")
+        return
+    for table, final_df in result.items():
+        if len(final_df) == 0:
+            print(f"No valid {table} data found for player {player_name}, skipping...")
+    write_queue.put((player_url, result))
+
+
+def parse_stage(fetch_queue, write_queue, parse_func, workers, max_pending, metrics):
+    """Parse pages in a process pool while the fetch stage keeps downloading"""
+    pending = deque()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                item = fetch_queue.get()
+                if item is None:
+                    break
+                player_name, player_url, tables, html = item
+                pending.append((player_name, player_url,
+                                pool.submit(timed_parse, parse_func, html, player_name, tables)))
+
+                # Forward finished work in order, and wait on the oldest job once too much is in flight
+                while pending and (pending[0][2].done() or len(pending) >= max_pending):
+                    forward_result(pending.popleft(), write_queue, metrics)
+
+            while pending:
+                forward_result(pending.popleft(), write_queue, metrics)
+    finally:
+        write_queue.put(None)
+
+
+def read_csv_header(path):
+    """Return the column names from the first line of a CSV, or None if the file is missing or empty"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f), None)
+    if not header:
+        return None
+    return [col.strip() for col in header]
+
+
+def csv_header_line(path, columns):
+    """Header line for a new CSV, in the separator style that file has always used"""
+    return header_separators.get(os.path.basename(path), ',').join(columns) + '\n'
+
+
+def write_csv_header(path, columns):
+    """Start a CSV over with only its header line"""
+    with open(path, 'w', newline='') as f:
+        f.write(csv_header_line(path, columns))
+
+
+class CsvBatchWriter:
+    """Buffer rows for one CSV in memory and flush them in batches.
+
+    Every flush appends the whole batch with one write and an fsync, so a
+    flush costs the size of the batch, not of the file. The length of the
+    file up to its last complete batch is kept in a small sidecar
+    (<path>.committed), replaced atomically after each flush. A writer
+    opening a file whose run was killed mid-write truncates it back to that
+    length, dropping the torn batch; close() removes the sidecar at the end
+    of a clean run. Rows are checked against the column schema from the
+    file's header line before they are written.
+    """
+
+    def __init__(self, path, columns=None):
+        self.path = path
+        self.committed_path = path + '.committed'
+        self.committed = self.recover()
+        self.columns = read_csv_header(path) or columns
+        if not self.columns:
+            raise ValueError(f"No column schema found for {path}")
+        self.frames = []
+
+    def recover(self):
+        """Cut off anything past the last committed batch of an interrupted run and record the starting length"""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        try:
+            with open(self.committed_path, 'r') as f:
+                committed = int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            committed = size
+        # A file shorter than its sidecar was started over since (e.g. a fresh scrape rewrote the header)
+        committed = min(committed, size)
+        if committed < size:
+            print(f"Dropping {size - committed} bytes of an interrupted batch from {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(committed)
+                os.fsync(f.fileno())
+        self.save_committed(committed)
+        return committed
+
+    def save_committed(self, length):
+        """Atomically record how much of the file holds complete batches"""
+        with open(self.committed_path + '.tmp', 'w') as f:
+            f.write(f"{length}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self.committed_path + '.tmp', self.committed_path)
+
+    def add(self, frame):
+        """Validate a DataFrame against the schema and buffer it"""
+        unexpected = [col for col in frame.columns if col not in self.columns]
+        if unexpected:
+            print(f"Dropping columns not in {self.path} header: {unexpected}")
+        missing = [col for col in self.columns if col not in frame.columns]
+        if 'Player' in missing:
+            raise ValueError(f"Rows for {self.path} are missing the Player column")
+        # Reorder to the header's column order, leaving missing stats empty
+        self.frames.append(frame.reindex(columns=self.columns))
+
+    def flush(self):
+        """Append all buffered rows after the last committed batch in one write, then commit the new length"""
+        if not self.frames:
+            return
+        batch = pd.concat(self.frames, ignore_index=True)
+        text = batch.to_csv(header=False, index=False)
+
+        with open(self.path, 'r+b' if os.path.exists(self.path) else 'w+b') as f:
+            offset = self.committed
+            # Anything past the committed length is a batch that failed part way
+            f.truncate(offset)
+            if offset == 0:
+                text = csv_header_line(self.path, self.columns) + text
             else:
-                print(f"Column '{col}' does not exist in final_df.")
-
-        # Drop rows where all columns are NA
-        final_df = final_df.dropna(how='all')
-        # Summarize career statistics
-        columns_to_summarize = [
-            'G', 'GS', 'Att', 'Yds', 'TD', 'Rec', 'Y/R', 'Tgt', 'Touch', 'YScm', 'RRTD', 'Fmb'
-        ]
-        
-        final_df.to_csv("data_used/historical_seasons_scrim.csv",mode='a',header=False,index=False)
-        # Initialize career_stats with the first row for Season, Age, Team, Pos
-        if len(final_df) > 0:
-            career_stats = final_df[['Player', 'Age', 'Team', 'Pos']].iloc[len(final_df)-1]
-            
-            # Loop through the columns and calculate the mean if the column exists
-            for col in columns_to_summarize:
-                if col in final_df.columns:
-                    career_stats[col] = final_df[col].mean()  # Calculate mean
-                else:
-                    career_stats[col] = None  # Set to None if the column does not exist
-
-            career_stats['FP'] = (career_stats['YScm'] * 0.1)+(career_stats['Rec']*1)+(career_stats['RRTD']*6)+(career_stats['Fmb']*-2)
-
-            # Convert the Series to a DataFrame
-            career_stats_df = pd.DataFrame(career_stats).T
-            career_stats_df.to_csv('data_used/train.csv', mode='a',header=False,index=False)
-        else:
-            print(f"No valid data found for player {player_names[counter]}, skipping...")
-        
-        counter += 1  # Ensure this is executed at the end of processing
-
-"""""
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-    
\ No newline at end of file
+                # Make sure new rows start on their own line
+                f.seek(offset - 1)
+                if f.read(1) != b'\n':
+                    text = '\n' + text
+            data = text.encode('utf-8')
+            f.seek(offset)
+            try:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                f.truncate(offset)
+                raise
+        self.committed = offset + len(data)
+        self.save_committed(self.committed)
+        self.frames = []
+
+    def close(self):
+        """Flush what is left and drop the sidecar; the file is complete"""
+        self.flush()
+        try:
+            os.remove(self.committed_path)
+        except FileNotFoundError:
+            pass
+
+
+def write_stage(write_queue, writers, batch_size, metrics):
+    """Single writer: collect parsed season rows, summarize careers and flush to disk in batches"""
+    pending = {table: [] for table in writers}
+    pending_rows = 0
+    while True:
+        item = write_queue.get()
+        if item is None:
+            break
+        player_url, result = item
+        for table, final_df in result.items():
+            metrics.record(player_url, **{f'rows_{table}': len(final_df)})
+            if len(final_df) > 0:
+                pending[table].append(final_df.assign(player_url=player_url))
+                pending_rows += len(final_df)
+
+        # Flush every file together so a player's seasons and career rows land in the same batch
+        if pending_rows >= batch_size:
+            flush_tables(pending, writers, metrics)
+            pending_rows = 0
+
+    flush_tables(pending, writers, metrics)
+
+
+def flush_tables(pending, writers, metrics):
+    """Summarize the buffered season rows per table and write seasons and careers to disk"""
+    start = time.perf_counter()
+    for table, frames in pending.items():
+        if not frames:
+            continue
+        seasons = pd.concat(frames, ignore_index=True)
+        columns_to_summarize, fantasy_points = player_tables[table][3:]
+        career = summarize_careers(seasons, columns_to_summarize, fantasy_points)
+
+        seasons_writer, career_writer = writers[table]
+        seasons_writer.add(seasons.drop(columns='player_url'))
+        career_writer.add(career)
+        seasons_writer.flush()
+        career_writer.flush()
+        frames.clear()
+    metrics.record_flush(time.perf_counter() - start)
+
+
+def make_fetcher(delay=request_delay):
+    """Fetcher with retries and backoff, paced by one circuit breaker for the whole run"""
+    return Fetcher(CircuitBreaker(delay), headers=headers)
+
+
+def run_pipeline(jobs, parse_func, outputs, fetcher=None, fetchers=fetch_workers, workers=parse_workers,
+                 max_queue=queue_size, batch_size=write_batch_size, metrics_file=None, root_url=rootURL):
+    """Fetch, parse and write player pages as three stages joined by bounded queues.
+
+    Returns the run's ScrapeMetrics; they are also printed and appended to metrics_file as JSON lines.
+    """
+    metrics = ScrapeMetrics()
+    fetcher = fetcher or make_fetcher()
+
+    # Build the writers first so a bad schema fails before any page is fetched
+    writers = {
+        table: (CsvBatchWriter(seasons_path, season_columns), CsvBatchWriter(career_path, career_columns))
+        for table, (seasons_path, career_path, season_columns, career_columns) in outputs.items()
+    }
+
+    fetch_queue = queue.Queue(maxsize=max_queue)
+    write_queue = queue.Queue(maxsize=max_queue)
+
+    fetch_thread = threading.Thread(target=fetch_stage,
+                                    args=(jobs, fetch_queue, fetcher, metrics, fetchers, root_url), daemon=True)
+    parser = threading.Thread(target=parse_stage,
+                              args=(fetch_queue, write_queue, parse_func, workers, max_queue, metrics),
+                              daemon=True)
+    fetch_thread.start()
+    parser.start()
+
+    # The writer runs on the calling thread
+    write_stage(write_queue, writers, batch_size, metrics)
+    fetch_thread.join()
+    parser.join()
+    for seasons_writer, career_writer in writers.values():
+        seasons_writer.close()
+        career_writer.close()
+
+    metrics.finish()
+    print(metrics.report())
+    if metrics_file:
+        metrics.export_jsonl(metrics_file)
+    return metrics
+
+
+def existing_players(path):
+    """Names already summarized in a training CSV"""
+    if read_csv_header(path) is None:
+        return set()
+    df = pd.read_csv(path)
+    return set(df['Player'].dropna())
+
+
+def collect_player_links(list_url, fetcher):
+    """Return (name, url) pairs for every player linked from a season list page"""
+    try:
+        res = fetcher.get(list_url)
+    except FetchError as e:
+        print(f"Failed to retrieve player list {list_url}. {e}")
+        return []
+
+    soup = BeautifulSoup(res.text, features="html.parser")
+
+    # Player names sit in left-aligned cells; team and award links in the same cells are skipped
+    links = []
+    for td in soup.find_all('td', class_='left'):
+        a_tag = td.find('a')
+        if a_tag and a_tag.get('href', '').startswith('/players/'):
+            links.append((a_tag.text, a_tag['href']))
+    return links
+
+
+def collect_season_players(seasons, pages, fetcher, root_url=rootURL):
+    """Collect the players listed on several list pages across several seasons.
+
+    Returns {player_url: (player_name, set of pages the player appeared on)},
+    so a player listed in many seasons, or on both the passing and scrimmage
+    lists, becomes a single unit of work.
+    """
+    players = {}
+    for season in seasons:
+        for page in pages:
+            list_url = root_url + season_list_path.format(season=season, page=page)
+            print(f"Collecting players from {list_url}")
+            for player_name, player_url in collect_player_links(list_url, fetcher):
+                if player_url not in players:
+                    players[player_url] = (player_name, set())
+                players[player_url][1].add(page)
+    print(f"Found {len(players)} unique players for seasons {seasons[0]}-{seasons[-1]}")
+    return players
+
+
+def build_jobs(players, tables, outputs):
+    """Work list of (name, url, tables) for every player, skipping tables we already have.
+
+    Every player's rushing/receiving table is kept (dual-threat QBs feed the skilled
+    model too), but passing tables only for players on a passing list.
+    """
+    done = {table: existing_players(outputs[table][1]) for table in tables}
+    jobs = []
+    for player_url, (player_name, pages) in players.items():
+        player_tables = [table for table in tables
+                         if (table == 'scrimmage' or table in pages) and player_name not in done[table]]
+        if not player_tables:
+            print(f"Player {player_url} already exists in the dataset. Skipping...")
+            continue
+        jobs.append((player_name, player_url, player_tables))
+    return jobs
+
+
+def scrape(seasons, tables=('passing', 'scrimmage'), directory=output_dir, clear=False, root_url=rootURL,
+           delay=request_delay, fetchers=fetch_workers, workers=parse_workers, batch_size=write_batch_size):
+    """Scrape every player listed for the given seasons and append their stats to the CSVs in directory.
+
+    Returns an exit code: exit_ok, exit_partial or exit_failed.
+    """
+    os.makedirs(directory, exist_ok=True)
+    outputs = scrape_outputs(directory, tables)
+    if clear:
+        # Initialize the files with headers
+        for seasons_path, career_path, season_columns, career_columns in outputs.values():
+            write_csv_header(career_path, career_columns)
+            write_csv_header(seasons_path, season_columns)
+
+    # One deduplicated work list for the passing (quarterbacks) and scrimmage (skilled positions) lists
+    fetcher = make_fetcher(delay)
+    players = collect_season_players(list(seasons), list(tables), fetcher, root_url)
+    if not players:
+        print("No players found on any season list page.")
+        return exit_failed
+
+    jobs = build_jobs(players, tables, outputs)
+    if not jobs:
+        print("Nothing new to scrape.")
+        return exit_ok
+
+    metrics = run_pipeline(jobs, parse_player_tables, outputs, fetcher, fetchers=fetchers, workers=workers,
+                           batch_size=batch_size, metrics_file=os.path.join(directory, metrics_file_name),
+                           root_url=root_url)
+    summary = metrics.summary()
+    if summary['pages_fetched'] == 0:
+        return exit_failed
+    if summary['pages_failed'] or summary['parse_errors']:
+        return exit_partial
+    return exit_ok
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Scrape player season stats from Pro Football Reference into the training CSVs",
+        epilog=f"Exit status: {exit_ok} success, {exit_partial} some pages failed, "
+               f"{exit_failed} nothing could be fetched, 1 unexpected error, 2 bad arguments")
+    parser.add_argument('--season', type=int, default=None,
+                        help="Scrape a single season (shorthand for --first-season N --last-season N)")
+    parser.add_argument('--first-season', type=int, default=first_season)
+    parser.add_argument('--last-season', type=int, default=None,
+                        help="Last season to scrape (default: the first season)")
+    parser.add_argument('--positions', nargs='+', choices=list(scrape_files), default=list(scrape_files),
+                        help="Position groups to scrape: passing (QBs) and/or scrimmage (skilled positions)")
+    parser.add_argument('--clear', action='store_true', help="Start the output CSVs over before scraping")
+    parser.add_argument('--output-dir', default=output_dir, help="Directory the CSVs are written to")
+    parser.add_argument('--root-url', default=rootURL, help="Site to scrape, e.g. a local stub server")
+    parser.add_argument('--delay', type=float, default=request_delay, help="Base seconds between requests")
+    parser.add_argument('--fetch-workers', type=int, default=fetch_workers)
+    parser.add_argument('--parse-workers', type=int, default=parse_workers)
+    parser.add_argument('--batch-size', type=int, default=write_batch_size,
+                        help="Season rows buffered before each write")
+    args = parser.parse_args(argv)
+
+    if args.season is not None:
+        args.first_season = args.last_season = args.season
+    if args.last_season is None:
+        args.last_season = args.first_season
+    if args.last_season < args.first_season:
+        parser.error("--last-season must not be before --first-season")
+    if args.fetch_workers < 1 or args.parse_workers < 1 or args.batch_size < 1:
+        parser.error("worker counts and batch size must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return scrape(range(args.first_season, args.last_season + 1), tuple(args.positions), args.output_dir,
+                  args.clear, args.root_url.rstrip('/'), args.delay, args.fetch_workers, args.parse_workers,
+                  args.batch_size)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBRegressor
+import xgboost
+
+# Fitted models are saved as models/<name>/<version>.joblib, with models/<name>/LATEST naming the current one
+models_dir = 'models'
+# Bump when the artifact layout changes so old files are rejected instead of misread
+artifact_format = 1
+
+# Incremental updates fall back to a full retrain when new rows' mean moves more than this many
+# training standard deviations on any feature, or the model's error on them grows by this factor
+drift_threshold = 0.5
+error_threshold = 1.5
+
+
+def feature_fingerprint(features):
+    """Short hash of the ordered feature list a model was trained on"""
+    return hashlib.sha256(json.dumps(list(features)).encode()).hexdigest()[:16]
+
+
+def prepare_training_data(train_data, test_data, features, weight_historical, weight_recent):
+    """Impute, scale and weight historical plus recent seasons into one training matrix.
+
+    Returns (imputer, scaler, X_combined, y_combined).
+    """
+    X_historical = np.array(train_data[features])
+    y_historical = np.array(train_data['FP'])
+
+    X_recent = np.array(test_data[features])
+    y_recent = np.array(test_data['FP'])
+
+    # Initialize imputer with median strategy and normalize features
+    imputer = SimpleImputer(strategy='median')
+    scaler = StandardScaler()
+    X_historical = scaler.fit_transform(imputer.fit_transform(X_historical))
+    X_recent = scaler.transform(imputer.transform(X_recent))
+
+    # Combine data with weights
+    X_combined = np.vstack([
+        X_historical * weight_historical,
+        X_recent * weight_recent
+    ])
+    y_combined = np.concatenate([y_historical, y_recent])
+    return imputer, scaler, X_combined, y_combined
+
+
+def fit_projection(train_data, test_data, features, params, weight_historical, weight_recent):
+    """Fit the imputer, scaler and booster on historical plus recent seasons.
+
+    Returns (imputer, scaler, model, X_combined, y_combined) so callers can
+    cross-validate on exactly the rows the model was fitted on.
+    """
+    imputer, scaler, X_combined, y_combined = prepare_training_data(
+        train_data, test_data, features, weight_historical, weight_recent)
+    model = XGBRegressor(**params)
+    model.fit(X_combined, y_combined)
+    return imputer, scaler, model, X_combined, y_combined
+
+
+def row_hashes(frame, features):
+    """One hash per row of player, features and target, to tell which rows a model has already seen"""
+    return pd.util.hash_pandas_object(frame[['Player'] + list(features) + ['FP']], index=False).to_numpy()
+
+
+def feature_stats(frame, features):
+    """Per-feature mean and standard deviation, ignoring missing values"""
+    values = np.array(frame[list(features)], dtype=float)
+    return np.nanmean(values, axis=0), np.nanstd(values, axis=0)
+
+
+def training_metadata(model, X_combined, y_combined, train_data, test_data, features):
+    """What an incremental update needs to know about a freshly trained model"""
+    return {
+        'row_hashes': np.concatenate([row_hashes(train_data, features), row_hashes(test_data, features)]),
+        # Historical careers and recent seasons are distributed very differently, so drift is judged per source
+        'feature_stats': {'historical': feature_stats(train_data, features),
+                          'recent': feature_stats(test_data, features)},
+        'train_rmse': float(np.sqrt(np.mean((model.predict(X_combined) - y_combined) ** 2))),
+        'training_rows': len(y_combined),
+    }
+
+
+def save_artifact(name, imputer, scaler, model, features, clip_max, directory=models_dir, **metadata):
+    """Save a fitted model as a new version and point LATEST at it. Returns the artifact dict."""
+    model_dir = os.path.join(directory, name)
+    version = datetime.now().strftime('%Y%m%d-%H%M%S')
+    # Never overwrite an earlier version saved within the same second (e.g. a train straight after an update)
+    suffix = 1
+    while os.path.exists(os.path.join(model_dir, f'{version}.joblib')):
+        suffix += 1
+        version = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{suffix}"
+    artifact = {
+        'artifact_format': artifact_format,
+        'name': name,
+        'version': version,
+        'features': list(features),
+        'feature_fingerprint': feature_fingerprint(features),
+        'clip_max': float(clip_max),
+        'xgboost_version': xgboost.__version__,
+        'imputer': imputer,
+        'scaler': scaler,
+        'model': model,
+        **metadata,
+    }
+    os.makedirs(model_dir, exist_ok=True)
+    joblib.dump(artifact, os.path.join(model_dir, f'{version}.joblib'))
+    with open(os.path.join(model_dir, 'LATEST'), 'w') as f:
+        f.write(version + '\n')
+    print(f"Saved {name} model version {version} to {model_dir}")
+    return artifact
+
+
+def latest_version(name, directory=models_dir):
+    """Version LATEST points at, or None if the model has never been trained"""
+    path = os.path.join(directory, name, 'LATEST')
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read().strip() or None
+
+
+def load_artifact(name, version=None, directory=models_dir):
+    """Load a saved model (the latest version by default)"""
+    version = version or latest_version(name, directory)
+    if version is None:
+        raise FileNotFoundError(f"No trained {name} model in {directory}; train it first")
+    artifact = joblib.load(os.path.join(directory, name, f'{version}.joblib'))
+    if artifact.get('artifact_format') != artifact_format:
+        raise ValueError(f"{name} model {version} uses artifact format {artifact.get('artifact_format')}, "
+                         f"expected {artifact_format}; retrain it")
+    return artifact
+
+
+def check_features(artifact, features):
+    """Fail loudly when the code's feature list no longer matches what the model was trained on"""
+    if feature_fingerprint(features) != artifact['feature_fingerprint']:
+        raise ValueError(f"{artifact['name']} model {artifact['version']} was trained on features "
+                         f"{artifact['features']}, not {list(features)}; retrain it")
+
+
+def predict_projection(artifact, frame):
+    """Score rows with a saved model: impute, scale and predict in one batch"""
+    X = transform_features(artifact, frame)
+    return np.clip(artifact['model'].predict(X), 0, artifact['clip_max'])
+
+
+def transform_features(artifact, frame):
+    """Impute and scale rows with a saved model's fitted imputer and scaler"""
+    missing = [col for col in artifact['features'] if col not in frame.columns]
+    if missing:
+        raise ValueError(f"Rows are missing features {missing} needed by {artifact['name']} model")
+    return artifact['scaler'].transform(artifact['imputer'].transform(np.array(frame[artifact['features']])))
+
+
+def update_projection(artifact, train_data, test_data, weight_historical, weight_recent, new_trees=50,
+                      max_shift=drift_threshold, max_error_ratio=error_threshold):
+    """Warm-start a saved model on the rows it has not seen yet.
+
+    The saved imputer and scaler are reused so the existing trees keep their
+    meaning, and new_trees boosting rounds are added on the new rows only.
+    Returns (model, report); model is None when there is nothing new or when
+    the new rows have drifted enough that report['action'] is 'retrain'.
+    """
+    report = {'action': 'none', 'new_rows': 0}
+    if 'row_hashes' not in artifact or 'feature_stats' not in artifact:
+        report.update(action='retrain', reason="model was saved before incremental updates")
+        return None, report
+
+    features = artifact['features']
+    shifts = np.zeros(len(features))
+    X_parts, y_parts = [], []
+    for source, data, weight in (('historical', train_data, weight_historical), ('recent', test_data, weight_recent)):
+        new = data[~np.isin(row_hashes(data, features), artifact['row_hashes'])]
+        if len(new):
+            # How far the new rows' mean sits from the rows this model saw from the same file, in SDs
+            mean, std = artifact['feature_stats'][source]
+            new_mean = feature_stats(new, features)[0]
+            shifts = np.fmax(shifts, np.abs(new_mean - mean) / np.where(std > 0, std, 1.0))
+            X_parts.append(transform_features(artifact, new) * weight)
+            y_parts.append(np.array(new['FP']))
+            report['new_rows'] += len(new)
+    if not X_parts:
+        return None, report
+
+    X_new = np.vstack(X_parts)
+    y_new = np.concatenate(y_parts)
+    rmse = float(np.sqrt(np.mean((artifact['model'].predict(X_new) - y_new) ** 2)))
+    report.update(
+        feature_shift=float(shifts.max()),
+        shifted_feature=features[int(shifts.argmax())],
+        error_ratio=rmse / artifact['train_rmse'] if artifact['train_rmse'] else float('inf'),
+    )
+    if report['feature_shift'] > max_shift or report['error_ratio'] > max_error_ratio:
+        report.update(action='retrain', reason=f"drift: {report['shifted_feature']} moved "
+                                               f"{report['feature_shift']:.2f} SD, error x{report['error_ratio']:.2f}")
+        return None, report
+
+    params = {**artifact.get('params', {}), 'n_estimators': new_trees}
+    model = XGBRegressor(**params)
+    model.fit(X_new, y_new, xgb_model=artifact['model'].get_booster())
+    report['action'] = 'update'
+    return model, report
+
+
+def save_update(artifact, model, train_data, test_data, new_rows):
+    """Save a warm-started model as a new version that remembers every row it has now seen"""
+    metadata = {key: value for key, value in artifact.items()
+                if key not in ('artifact_format', 'name', 'version', 'features', 'feature_fingerprint', 'clip_max',
+                               'xgboost_version', 'imputer', 'scaler', 'model')}
+    features = artifact['features']
+    metadata.update(
+        row_hashes=np.union1d(artifact['row_hashes'],
+                              np.concatenate([row_hashes(train_data, features), row_hashes(test_data, features)])),
+        training_rows=artifact.get('training_rows', 0) + new_rows,
+        base_version=artifact.get('base_version', artifact['version']),
+        updates=artifact.get('updates', 0) + 1,
+    )
+    return save_artifact(artifact['name'], artifact['imputer'], artifact['scaler'], model, features,
+                         artifact['clip_max'], **metadata)
+
+
+def update_model(script, new_trees=50, max_shift=drift_threshold, max_error_ratio=error_threshold, train_data=None,
+                 test_data=None):
+    """Add trees to a model script's saved model for rows it has not seen, or retrain from scratch if the data has drifted.
+
+    script is a prediction_model_* module: its model_name, features,
+    train_path, test_path and weights say what to update, and its
+    load_data and train are used to read the CSVs and to retrain.
+    """
+    artifact = load_artifact(script.model_name)
+    check_features(artifact, script.features)
+    if train_data is None:
+        train_data = script.load_data(script.train_path)
+    if test_data is None:
+        test_data = script.load_data(script.test_path)
+
+    model, report = update_projection(artifact, train_data, test_data, script.weight_historical, script.weight_recent,
+                                      new_trees, max_shift, max_error_ratio)
+    print(f"Incremental update of {script.model_name} model {artifact['version']}: {report}")
+    if report['action'] == 'retrain':
+        print(f"Retraining from scratch ({report['reason']})")
+        return script.train(train_data=train_data, test_data=test_data)
+    if model is None:
+        print("No new rows since the last training run")
+        return artifact
+    return save_update(artifact, model, train_data, test_data, report['new_rows'])
+
+
+def run_command_line(script, description, args=None):
+    """The train / update / predict command line every model script runs as __main__"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('command', nargs='?', choices=['train', 'update', 'predict'], default='predict',
+                        help="predict (default) scores with the saved model, training one first if none exists; "
+                             "update adds trees for new rows, retraining only if the data has drifted")
+    parser.add_argument('--cv', action='store_true', help="Run 5-fold cross-validation when training")
+    parser.add_argument('--version', default=None, help="Model version to predict with (default: latest)")
+    parser.add_argument('--trees', type=int, default=50, help="Boosting rounds added by an update")
+    parser.add_argument('--max-shift', type=float, default=drift_threshold,
+                        help="Retrain instead of updating when a feature's mean moves more SDs than this")
+    parser.add_argument('--max-error-ratio', type=float, default=error_threshold,
+                        help="Retrain instead of updating when error on new rows grows by more than this factor")
+    args = parser.parse_args(args)
+
+    if args.command == 'train':
+        script.predict(script.train(args.cv))
+    elif args.command == 'update' and latest_version(script.model_name) is not None:
+        script.predict(update_model(script, args.trees, args.max_shift, args.max_error_ratio))
+    elif latest_version(script.model_name) is None and args.version is None:
+        print(f"No saved {script.model_name} model yet, training one first")
+        script.predict(script.train(args.cv))
+    else:
+        script.predict(version=args.version)
@@ -0,0 +1,71 @@
+"""Train (or load) and run both projection models in one pass and write the combined table the app reads.
+
+    python projection_pipeline.py             # use the saved models, training any that are missing
+    python projection_pipeline.py train       # retrain both models from scratch
+    python projection_pipeline.py update      # warm-start both models on new rows
+
+All four career CSVs are loaded once up front. The QB and RB/WR/TE models
+are then fitted and scored at the same time in a process pool, and a single
+projections.csv is written with each QB's passing and rushing points
+already summed.
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from projection_model import latest_version, load_artifact, update_model
+from projection_service import combine_projections, projection_models, projections_path
+
+
+def load_model_data():
+    """{model name: (train frame, test frame)} for every model, each CSV read once"""
+    return {name: (script.load_data(script.train_path), script.load_data(script.test_path))
+            for name, script in projection_models.items()}
+
+
+def project(name, train_data, test_data, mode='predict'):
+    """Fit or load one model and score its player pool. Runs in a worker process."""
+    script = projection_models[name]
+    start = time.perf_counter()
+    if mode == 'train' or latest_version(name) is None:
+        artifact = script.train(train_data=train_data, test_data=test_data)
+    elif mode == 'update':
+        artifact = update_model(script, train_data=train_data, test_data=test_data)
+    else:
+        artifact = load_artifact(name)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predictions = script.score(artifact, test_data)
+    return predictions, artifact['version'], fit_seconds, time.perf_counter() - start
+
+
+def run_pipeline(mode='predict', output_path=projections_path):
+    """Project every model concurrently and write the combined table. Returns the table."""
+    start = time.perf_counter()
+    data = load_model_data()
+    load_seconds = time.perf_counter() - start
+
+    with ProcessPoolExecutor(max_workers=len(data)) as pool:
+        futures = {name: pool.submit(project, name, train_data, test_data, mode)
+                   for name, (train_data, test_data) in data.items()}
+        results = {name: future.result() for name, future in futures.items()}
+
+    projections = combine_projections(results['skilled'][0], results['passing'][0])
+    projections.to_csv(output_path, index=False)
+
+    print(f"Loaded training data in {load_seconds * 1000:.0f} ms")
+    for name, (predictions, version, fit_seconds, score_seconds) in results.items():
+        print(f"  {name} model {version}: {len(predictions)} players, "
+              f"fit/load {fit_seconds:.2f}s, scored in {score_seconds * 1000:.0f} ms")
+    print(f"Wrote {len(projections)} projections to {output_path} in {time.perf_counter() - start:.1f}s")
+    return projections
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run both projection models and write the combined projections")
+    parser.add_argument('mode', nargs='?', choices=['predict', 'train', 'update'], default='predict',
+                        help="predict (default) uses the saved models, training any that are missing")
+    parser.add_argument('--output', default=projections_path)
+    args = parser.parse_args()
+
+    run_pipeline(args.mode, args.output)
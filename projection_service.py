@@ -0,0 +1,70 @@
+import hashlib
+import os
+import pandas as pd
+import prediction_model_passing
+import prediction_model_skilled
+from player_ids import player_id_series
+from projection_model import check_features, latest_version, load_artifact
+
+# Model scripts by saved model name: each knows its player pool CSV, features and how to score it
+projection_models = {
+    'skilled': prediction_model_skilled,
+    'passing': prediction_model_passing,
+}
+
+# Combined projection table written by projection_pipeline.py and read by the app in one load
+projections_path = 'data_used/projections.csv'
+
+
+def file_hash(path):
+    """Content hash of a player pool CSV, so cached projections refresh when the data changes"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_model(name, version):
+    """Load a saved model and make sure it matches the features its script builds"""
+    artifact = load_artifact(name, version)
+    check_features(artifact, projection_models[name].features)
+    return artifact
+
+
+def score_player_pool(name, artifact):
+    """Predicted fantasy points for every player in the model's pool, in one batched predict"""
+    script = projection_models[name]
+    predictions = script.score(artifact, script.load_data(script.test_path))
+    return predictions.dropna(subset=['Player']).reset_index(drop=True)
+
+
+def projection_source(name):
+    """(version, pool hash) identifying what a model would score right now, or None if it was never trained"""
+    version = latest_version(name)
+    if version is None:
+        return None
+    return version, file_hash(projection_models[name].test_path)
+
+
+def combine_projections(skilled, passing):
+    """One row per player with the scrimmage and passing projections and their total.
+
+    A QB's total is passing plus the rushing/receiving projection from the
+    skilled model; everyone else's total is their scrimmage projection. The
+    two pools are matched on player id, so spelling differences don't split a QB.
+    """
+    # Keep each player's first (highest for passing) projection
+    scrimmage = skilled.assign(Id=player_id_series(skilled['Player'])).drop_duplicates('Id')[
+        ['Id', 'Player', 'Predicted_FP']].rename(columns={'Predicted_FP': 'Scrimmage_FP'})
+    passing = passing.assign(Id=player_id_series(passing['Player'])).drop_duplicates('Id')[
+        ['Id', 'Player', 'Predicted_FP']].rename(columns={'Predicted_FP': 'Passing_FP'})
+    combined = scrimmage.merge(passing, on='Id', how='outer', suffixes=('', '_passing'))
+    combined['Player'] = combined['Player'].fillna(combined['Player_passing'])
+    combined['Projected_FP'] = combined['Passing_FP'].fillna(0) + combined['Scrimmage_FP'].fillna(0)
+    combined = combined[['Player', 'Passing_FP', 'Scrimmage_FP', 'Projected_FP']]
+    return combined.sort_values('Projected_FP', ascending=False).reset_index(drop=True)
+
+
+def load_projection_table(path=projections_path):
+    """The combined projection table written by the pipeline, or None if it has not been run"""
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path)
@@ -0,0 +1,173 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import requests
+
+# Status codes that mean the server wants us to slow down or try again later
+rate_limit_statuses = {429}
+server_error_statuses = {500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """A page that could not be fetched, classified by why.
+
+    kind is one of:
+      'rate_limited' - 429, retried after Retry-After or a backoff
+      'server'       - 5xx, retried with backoff
+      'network'      - connection error or timeout, retried with backoff
+      'not_found'    - 404/410, the page does not exist, never retried
+      'client'       - any other 4xx, never retried
+    """
+
+    retryable_kinds = {'rate_limited', 'server', 'network'}
+
+    def __init__(self, url, kind, status=None, message=''):
+        self.url = url
+        self.kind = kind
+        self.status = status
+        super().__init__(f"{kind} error fetching {url}" + (f" (status {status})" if status else '')
+                         + (f": {message}" if message else ''))
+
+    @property
+    def retryable(self):
+        return self.kind in self.retryable_kinds
+
+
+def classify_status(status_code):
+    """Return the FetchError kind for a status code, or None for success"""
+    if status_code < 400:
+        return None
+    if status_code in rate_limit_statuses:
+        return 'rate_limited'
+    if status_code in server_error_statuses or status_code >= 500:
+        return 'server'
+    if status_code in (404, 410):
+        return 'not_found'
+    return 'client'
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delay-seconds or HTTP-date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class CircuitBreaker:
+    """Request pacing shared by every fetch thread.
+
+    Requests are spaced at least `delay` seconds apart across the whole pool.
+    Each 429/5xx/network failure doubles the delay (up to max_delay), and a
+    Retry-After header holds every thread back until it has passed. After
+    failure_threshold failures in a row the circuit opens and the whole pool
+    pauses for `cooldown` seconds. Successes walk the delay back down to the
+    base rate.
+    """
+
+    def __init__(self, base_delay, max_delay=300.0, failure_threshold=3, cooldown=120.0, recovery=0.8):
+        self.lock = threading.Lock()
+        self.base_delay = base_delay
+        self.delay = base_delay
+        self.max_delay = max(max_delay, base_delay)
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.recovery = recovery
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.next_request_at = 0.0
+
+    def wait(self):
+        """Block until this thread may send a request; returns the seconds waited"""
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.open_until, self.next_request_at)
+            # Reserve our slot so other threads queue up behind it
+            self.next_request_at = start + self.delay
+        waited = start - now
+        if waited > 0:
+            time.sleep(waited)
+        return waited
+
+    def record_success(self):
+        with self.lock:
+            self.consecutive_failures = 0
+            self.delay = max(self.base_delay, self.delay * self.recovery)
+
+    def record_pushback(self, retry_after=None):
+        """The server pushed back: slow the whole pool down"""
+        with self.lock:
+            now = time.monotonic()
+            self.consecutive_failures += 1
+            self.delay = min(self.max_delay, max(self.delay, 1.0) * 2)
+            if retry_after:
+                self.open_until = max(self.open_until, now + retry_after)
+            if self.consecutive_failures >= self.failure_threshold:
+                self.open_until = max(self.open_until, now + self.cooldown)
+                print(f"Circuit open after {self.consecutive_failures} failures in a row: "
+                      f"pausing all requests for {self.open_until - now:.0f}s, delay now {self.delay:.1f}s")
+
+
+class Fetcher:
+    """GET pages with retries, exponential backoff with jitter and shared circuit breaking"""
+
+    def __init__(self, breaker, headers=None, max_retries=4, backoff_base=2.0, backoff_max=120.0,
+                 timeout=30, session=None):
+        self.breaker = breaker
+        self.headers = headers or {}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return max(retry_after or 0.0, random.uniform(0, cap))
+
+    def get(self, url, metrics=None, metrics_key=None):
+        """Return a successful response for url, or raise FetchError once retries run out.
+
+        When metrics is given, request time, waits and retries are added to metrics_key's record.
+        """
+        for attempt in range(self.max_retries + 1):
+            waited = self.breaker.wait()
+            if metrics is not None:
+                metrics.add(metrics_key, rate_limit_wait_seconds=waited)
+
+            retry_after = None
+            error = None
+            start = time.perf_counter()
+            try:
+                res = self.session.get(url, headers=self.headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = FetchError(url, 'network', message=str(e))
+            finally:
+                if metrics is not None:
+                    metrics.add(metrics_key, fetch_seconds=time.perf_counter() - start)
+            if error is None:
+                kind = classify_status(res.status_code)
+                if kind is None:
+                    self.breaker.record_success()
+                    return res
+                error = FetchError(url, kind, res.status_code)
+                retry_after = parse_retry_after(res.headers.get('Retry-After'))
+
+            if error.retryable:
+                self.breaker.record_pushback(retry_after)
+            if not error.retryable or attempt == self.max_retries:
+                raise error
+
+            backoff = self.backoff(attempt, retry_after)
+            print(f"{error}. Retrying in {backoff:.1f}s (attempt {attempt + 2}/{self.max_retries + 1})")
+            if metrics is not None:
+                metrics.add(metrics_key, retries=1, rate_limit_wait_seconds=backoff)
+            time.sleep(backoff)
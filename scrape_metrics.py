@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+from datetime import datetime
+
+
+def describe(values):
+    """Mean, median, 95th percentile and max of a list of timings"""
+    if not values:
+        return {'count': 0, 'mean': None, 'p50': None, 'p95': None, 'max': None}
+    ordered = sorted(values)
+
+    def percentile(pct):
+        return ordered[min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))]
+
+    return {
+        'count': len(ordered),
+        'mean': sum(ordered) / len(ordered),
+        'p50': percentile(0.5),
+        'p95': percentile(0.95),
+        'max': ordered[-1],
+    }
+
+
+class ScrapeMetrics:
+    """Per-player timings and counters for one scrape run.
+
+    Every pipeline stage records into the same object from its own thread,
+    so all updates go through a lock. Records are keyed by player URL.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.players = {}
+        self.write_seconds = 0.0
+        self.flushes = 0
+        self.run_started = datetime.now().isoformat(timespec='seconds')
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def _entry(self, player_url):
+        if player_url not in self.players:
+            self.players[player_url] = {'player_url': player_url, 'retries': 0, 'rate_limit_wait_seconds': 0.0}
+        return self.players[player_url]
+
+    def record(self, player_url, **values):
+        """Set fields on a player's record"""
+        with self.lock:
+            self._entry(player_url).update(values)
+
+    def add(self, player_url, **values):
+        """Add to counters on a player's record"""
+        with self.lock:
+            entry = self._entry(player_url)
+            for key, value in values.items():
+                entry[key] = entry.get(key, 0) + value
+
+    def record_flush(self, seconds):
+        with self.lock:
+            self.write_seconds += seconds
+            self.flushes += 1
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    def summary(self):
+        """Totals and timing distributions for the whole run"""
+        with self.lock:
+            players = [dict(entry) for entry in self.players.values()]
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        fetched = [p for p in players if p.get('status') == 200]
+        rows = sum(value for p in players for key, value in p.items() if key.startswith('rows_'))
+
+        slowest = sorted(players, key=lambda p: p.get('fetch_seconds', 0) + p.get('parse_seconds', 0), reverse=True)
+        return {
+            'type': 'summary',
+            'run_started': self.run_started,
+            'elapsed_seconds': elapsed,
+            'players': len(players),
+            'pages_fetched': len(fetched),
+            'pages_failed': len(players) - len(fetched),
+            'parse_errors': sum(1 for p in players if str(p.get('error', '')).startswith('parse')),
+            'bytes': sum(p.get('bytes', 0) for p in players),
+            'rows': rows,
+            'retries': sum(p.get('retries', 0) for p in players),
+            'rate_limit_wait_seconds': sum(p.get('rate_limit_wait_seconds', 0) for p in players),
+            'pages_per_minute': len(fetched) / elapsed * 60 if elapsed else 0.0,
+            'rows_per_second': rows / elapsed if elapsed else 0.0,
+            'fetch_seconds': describe([p['fetch_seconds'] for p in players if 'fetch_seconds' in p]),
+            'parse_seconds': describe([p['parse_seconds'] for p in players if 'parse_seconds' in p]),
+            'write_seconds': self.write_seconds,
+            'flushes': self.flushes,
+            'slowest_pages': [p['player_url'] for p in slowest[:5]],
+        }
+
+    def report(self):
+        """Human-readable summary for the end of a run"""
+        summary = self.summary()
+        lines = [
+            "Scrape summary:",
+            f"  Players: {summary['players']} | fetched: {summary['pages_fetched']} | failed: {summary['pages_failed']}"
+            f" | parse errors: {summary['parse_errors']}",
+            f"  Elapsed: {summary['elapsed_seconds']:.1f}s | {summary['pages_per_minute']:.1f} pages/min"
+            f" | {summary['rows_per_second']:.1f} rows/s",
+            f"  Transferred: {summary['bytes'] / 1024:.0f} KiB | rows written: {summary['rows']}",
+            f"  Retries: {summary['retries']} | rate-limit waits: {summary['rate_limit_wait_seconds']:.1f}s",
+        ]
+        for stage in ['fetch_seconds', 'parse_seconds']:
+            stats = summary[stage]
+            if stats['count']:
+                lines.append(f"  {stage.split('_')[0].title()}: mean {stats['mean'] * 1000:.0f} ms"
+                             f" | p95 {stats['p95'] * 1000:.0f} ms | max {stats['max'] * 1000:.0f} ms")
+        lines.append(f"  Write: {summary['write_seconds'] * 1000:.0f} ms over {summary['flushes']} flushes")
+        if summary['slowest_pages']:
+            lines.append(f"  Slowest pages: {', '.join(summary['slowest_pages'])}")
+        return '\n'.join(lines)
+
+    def export_jsonl(self, path):
+        """Append one JSON line per player plus a summary line, tagged with the run start time"""
+        with self.lock:
+            players = [dict(entry) for entry in self.players.values()]
+        with open(path, 'a', encoding='utf-8') as f:
+            for entry in players:
+                f.write(json.dumps({'type': 'player', 'run_started': self.run_started, **entry}) + '\n')
+            f.write(json.dumps(self.summary()) + '\n')
@@ -0,0 +1,140 @@
+"""Local stand-in for Pro Football Reference that injects 429s and 5xx errors.
+
+Used to check the scraper's retry, backoff and circuit-breaker behaviour
+without touching the real site:
+
+    python scrape_stub_server.py --port 8000 --rate-429 0.3 --rate-5xx 0.1
+    python scrape_stub_server.py --check      # run the fetch layer against a stub and print what happened
+    python profootball_scrapping.py --root-url http://127.0.0.1:8000 --output-dir /tmp/scrape --delay 0.1
+
+Pages are served from --fixtures when a matching saved file exists
+(e.g. players/B/BurrJo01.htm), otherwise a small generated page is returned.
+Season list pages (/years/...) link --list-size generated players.
+"""
+import argparse
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Set on the server: fixtures, rate_429, rate_5xx, retry_after, list_size, lock, counts
+    def do_GET(self):
+        server = self.server
+        roll = random.random()
+        with server.lock:
+            server.counts['requests'] += 1
+        if roll < server.rate_429:
+            self._respond(429, b'Too Many Requests', {'Retry-After': str(server.retry_after)})
+            return
+        if roll < server.rate_429 + server.rate_5xx:
+            self._respond(random.choice([500, 502, 503]), b'Server Error')
+            return
+
+        path = os.path.normpath(self.path.split('?')[0].lstrip('/'))
+        fixture = os.path.join(server.fixtures, path) if server.fixtures and not path.startswith('..') else None
+        if fixture and os.path.isfile(fixture):
+            with open(fixture, 'rb') as f:
+                self._respond(200, f.read())
+        elif self.path.startswith('/missing'):
+            self._respond(404, b'Not Found')
+        elif self.path.startswith('/years/'):
+            # Season list page linking a handful of stub players
+            links = ''.join(f'<tr><td class="left"><a href="/players/X/Stub{i:02d}.htm">Stub Player {i}</a></td></tr>'
+                            for i in range(server.list_size))
+            self._respond(200, f'<html><body><table><tbody>{links}</tbody></table></body></html>'.encode())
+        else:
+            # The scraper drops the first row of a table as its header, so generate a couple of seasons
+            passing = scrimmage = ''
+            for season in (2023, 2024):
+                row = (f'<tr><th data-stat="year_id">{season}</th><td data-stat="age">{season - 1997}</td>'
+                       f'<td data-stat="team_name_abbr">STB</td><td data-stat="pos">QB</td>')
+                passing += (f'{row}<td data-stat="pass_yds">{random.randint(0, 5000)}</td>'
+                            f'<td data-stat="pass_td">{random.randint(0, 40)}</td></tr>')
+                scrimmage += (f'{row}<td data-stat="rec">{random.randint(0, 100)}</td>'
+                              f'<td data-stat="rush_yds">{random.randint(0, 1500)}</td></tr>')
+            body = (f'<html><body><table class="stats_table" id="passing"><tbody>{passing}</tbody></table>'
+                    f'<table class="stats_table" id="rushing_and_receiving"><tbody>{scrimmage}</tbody></table>'
+                    f'</body></html>').encode()
+            self._respond(200, body)
+
+    def _respond(self, status, body, extra_headers=None):
+        with self.server.lock:
+            self.server.counts[status] = self.server.counts.get(status, 0) + 1
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(port=0, fixtures=None, rate_429=0.2, rate_5xx=0.1, retry_after=1, list_size=5):
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    server.list_size = list_size
+    server.fixtures = fixtures
+    server.rate_429 = rate_429
+    server.rate_5xx = rate_5xx
+    server.retry_after = retry_after
+    server.lock = threading.Lock()
+    server.counts = {'requests': 0}
+    return server
+
+
+def check_fetch_layer(pages=20, rate_429=0.3, rate_5xx=0.1):
+    """Fetch pages from a stub server through the scraper's fetch layer and report the outcome"""
+    from scrape_fetch import CircuitBreaker, Fetcher, FetchError
+    from scrape_metrics import ScrapeMetrics
+
+    server = make_server(rate_429=rate_429, rate_5xx=rate_5xx, retry_after=1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    root = f'http://127.0.0.1:{server.server_address[1]}'
+
+    fetcher = Fetcher(CircuitBreaker(0.05, max_delay=0.5, failure_threshold=5, cooldown=2), max_retries=5,
+                      backoff_base=0.2, backoff_max=2)
+    metrics = ScrapeMetrics()
+    start = time.perf_counter()
+    outcomes = {'ok': 0}
+    for page in range(pages):
+        player_url = f'/players/X/Stub{page:02d}.htm'
+        try:
+            res = fetcher.get(root + player_url, metrics, player_url)
+            metrics.record(player_url, status=res.status_code, bytes=len(res.content))
+            outcomes['ok'] += 1
+        except FetchError as e:
+            outcomes[e.kind] = outcomes.get(e.kind, 0) + 1
+    try:
+        fetcher.get(root + '/missing.htm')
+    except FetchError as e:
+        outcomes['missing page'] = e.kind
+    server.shutdown()
+
+    metrics.finish()
+    print(f"Outcomes: {outcomes} in {time.perf_counter() - start:.1f}s")
+    print(f"Server responses: {server.counts}")
+    print(metrics.report())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub Pro Football Reference server for testing the scraper fetch layer")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--fixtures', default=None, help="Directory of saved pages, laid out like the site's paths")
+    parser.add_argument('--rate-429', type=float, default=0.2, help="Fraction of requests answered with 429")
+    parser.add_argument('--rate-5xx', type=float, default=0.1, help="Fraction of requests answered with a 5xx")
+    parser.add_argument('--retry-after', type=int, default=5, help="Retry-After seconds sent with each 429")
+    parser.add_argument('--list-size', type=int, default=5, help="Players linked from each season list page")
+    parser.add_argument('--check', action='store_true', help="Run the fetch layer against a throwaway stub and exit")
+    args = parser.parse_args()
+
+    if args.check:
+        check_fetch_layer(rate_429=args.rate_429, rate_5xx=args.rate_5xx)
+    else:
+        server = make_server(args.port, args.fixtures, args.rate_429, args.rate_5xx, args.retry_after, args.list_size)
+        print(f"Serving stub site on http://127.0.0.1:{args.port}")
+        server.serve_forever()
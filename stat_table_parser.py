@@ -0,0 +1,222 @@
+import re
+import time
+import glob
+import os
+import lxml.html
+
+# Matches the opening tag of a stats table by its id, e.g. <table class="stats_table" id="passing">
+table_open_pattern = '<table\\b[^>]*\\bid="{table_id}"'
+
+passing_table_ids = ('passing',)
+scrimmage_table_ids = ('receiving_and_rushing', 'rushing_and_receiving')
+
+# Map data-stat attributes on the player page to our column names
+passing_stat_mapping = {
+    'year_id': 'Season',               # Year of the data
+    'age': 'Age',                       # Player's age
+    'team_name_abbr': 'Team',          # Team abbreviation
+    'pos': 'Pos',                       # Position (QB)
+    'games': 'G',                       # Games played
+    'games_started': 'GS',              # Games started
+    'qb_rec': 'QBrec',                 # Quarterback record (wins-losses-ties)
+    'pass_cmp': 'Cmp',                 # Completions
+    'pass_att': 'Att',                 # Attempts
+    'pass_cmp_pct': 'Cmp%',             # Completion percentage
+    'pass_yds': 'Yds',                 # Passing yards
+    'pass_td': 'TD',                   # Touchdowns
+    'pass_td_pct': 'TD%',               # Touchdown percentage
+    'pass_int': 'Int',                 # Interceptions
+    'pass_int_pct': 'Int%',             # Interception percentage
+    'pass_first_down': '1D',           # First downs
+    'pass_success': 'Succ%',            # Success percentage
+    'pass_long': 'Lng',                 # Longest pass
+    'pass_yds_per_att': 'Y/A',         # Yards per attempt
+    'pass_adj_yds_per_att': 'ANY/A',   # Adjusted net yards per attempt
+    'pass_yds_per_cmp': 'Y/C',         # Yards per completion
+    'pass_yds_per_g': 'Y/G',           # Yards per game
+    'pass_rating': 'Rate',              # Passer rating
+    'qbr': 'QBR',                      # Quarterback rating
+    'pass_sacked': 'Sk',               # Sacks
+    'pass_sacked_yds': 'Yds_sack',          # Yards lost to sacks
+    'pass_sacked_pct': 'Sk%',          # Sack percentage
+    'pass_net_yds_per_att': 'NY/A',    # Net yards per attempt
+    'pass_adj_net_yds_per_att': 'ANY/A', # Adjusted net yards per attempt
+    'comebacks': '4QC',                # Comebacks led
+    'gwd': 'GWD',                      # Game-winning drives
+    'av': 'AV',                        # Approximate Value
+    'awards': 'Awards'                 # Awards received
+}
+
+scrimmage_stat_mapping = {
+    'year_id': 'Season',
+    'age': 'Age',
+    'team_name_abbr': 'Team',
+    'comp_name_abbr': 'Lg',
+    'pos': 'Pos',
+    'games': 'G',
+    'games_started': 'GS',
+    'rush_att': 'Att',
+    'rush_yds': 'Yds',
+    'rush_td': 'TD',
+    'rush_first_down': '1D',
+    'rush_success': 'Succ%',
+    'rush_long': 'Lng',
+    'rush_yds_per_att': 'Y/A',
+    'rush_yds_per_g': 'Y/G',
+    'rush_att_per_g': 'A/G',
+    'targets': 'Tgt',
+    'rec': 'Rec',
+    'rec_yds': 'Yds',
+    'rec_yds_per_rec': 'Y/R',
+    'rec_td': 'TD',  # Note: This is repeated
+    'rec_first_down': '1D',  # Note: This is repeated
+    'rec_success': 'Succ%',
+    'rec_long': 'Lng',
+    'rec_per_g': 'R/G',
+    'rec_yds_per_g': 'Y/G',
+    'catch_pct': 'Ctch%',
+    'rec_yds_per_tgt': 'Y/Tgt',
+    'touches': 'Touch',
+    'yds_per_touch': 'Y/Tch',
+    'yds_from_scrimmage': 'YScm',
+    'rush_receive_td': 'RRTD',
+    'fumbles': 'Fmb',
+    'av': 'AV',
+}
+
+
+def extract_table_html(html, table_ids):
+    """Slice the raw markup of the first matching stats table out of a page.
+
+    Player pages are large, but only one table is needed, so the table is cut
+    out of the raw text before anything is parsed. Tables that Pro Football
+    Reference hides inside HTML comments are found the same way.
+    """
+    for table_id in table_ids:
+        match = re.search(table_open_pattern.format(table_id=re.escape(table_id)), html)
+        if not match:
+            continue
+        end = html.find('</table>', match.start())
+        if end == -1:
+            continue
+        return html[match.start():end + len('</table>')]
+    return None
+
+
+def parse_stat_table(table_html, data_stat_mapping):
+    """Parse the rows of a stats table into dicts keyed by the mapped column names"""
+    table = lxml.html.fragment_fromstring(table_html)
+    rows = []
+    for tr in table.iter('tr'):
+        # Skip header rows repeated inside the table body
+        if 'thead' in (tr.get('class') or '').split():
+            continue
+        formatted_row = {}
+        for cell in tr:
+            if cell.tag not in ('td', 'th'):
+                continue
+            stat_name = cell.get('data-stat')
+            if stat_name in data_stat_mapping:
+                # Same text as BeautifulSoup's get_text(strip=True)
+                formatted_row[data_stat_mapping[stat_name]] = ''.join(
+                    text.strip() for text in cell.itertext())
+        # Only add rows that have data
+        if formatted_row:
+            rows.append(formatted_row)
+    return rows
+
+
+def parse_stat_table_soup(html, table_ids, data_stat_mapping):
+    """Original full-page BeautifulSoup parse, kept for benchmarking"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, features="html.parser")
+    stats_table = None
+    for table_id in table_ids:
+        stats_table = soup.find('table', id=table_id)
+        if stats_table:
+            break
+    if not stats_table:
+        return None
+
+    rows = []
+    for row in stats_table.find_all('tr'):
+        if row.get('class') and 'thead' in row.get('class'):
+            continue
+        formatted_row = {}
+        for td in row.find_all(['td', 'th']):
+            stat_name = td.get('data-stat')
+            if stat_name in data_stat_mapping:
+                formatted_row[data_stat_mapping[stat_name]] = td.get_text(strip=True)
+        if formatted_row:
+            rows.append(formatted_row)
+    return rows
+
+
+def parse_player_page(html, table_ids, data_stat_mapping):
+    """Extract and parse one stats table from a player page, or None if it is missing"""
+    table_html = extract_table_html(html, table_ids)
+    if table_html is None:
+        return None
+    return parse_stat_table(table_html, data_stat_mapping)
+
+
+def benchmark_parse(fixture_dir, table_ids, data_stat_mapping, repeat=5):
+    """Compare per-page parse time of the targeted lxml path against the full BeautifulSoup parse.
+
+    Pages are found anywhere under fixture_dir, so the players/<letter>/<id>.htm
+    layout that scrape_stub_server --fixtures serves works as is. Pages
+    without the table are skipped.
+    """
+    results = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, '**', '*.htm*'), recursive=True)):
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            soup_rows = parse_stat_table_soup(html, table_ids, data_stat_mapping)
+        soup_time = (time.perf_counter() - start) / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            lxml_rows = parse_player_page(html, table_ids, data_stat_mapping)
+        lxml_time = (time.perf_counter() - start) / repeat
+        if lxml_rows is None:
+            continue
+
+        results.append({
+            'page': os.path.relpath(path, fixture_dir),
+            'rows': len(lxml_rows),
+            # BeautifulSoup's find() does not look inside HTML comments, where PFR ships most secondary tables
+            'soup_rows': None if soup_rows is None else len(soup_rows),
+            'matches': soup_rows == lxml_rows,
+            'soup_ms': soup_time * 1000,
+            'lxml_ms': lxml_time * 1000,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark stat table parsing over saved player pages")
+    parser.add_argument('fixture_dir', nargs='?', default='data_used/fixtures',
+                        help="Directory of saved Pro Football Reference player pages (.htm/.html)")
+    parser.add_argument('--table', choices=['passing', 'scrimmage'], default='passing')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.table == 'passing':
+        table_ids, data_stat_mapping = passing_table_ids, passing_stat_mapping
+    else:
+        table_ids, data_stat_mapping = scrimmage_table_ids, scrimmage_stat_mapping
+
+    results = benchmark_parse(args.fixture_dir, table_ids, data_stat_mapping, args.repeat)
+    if not results:
+        print(f"No saved pages with a {args.table} table found in {args.fixture_dir}")
+    for result in results:
+        speedup = result['soup_ms'] / result['lxml_ms'] if result['lxml_ms'] else float('inf')
+        identical = result['matches'] if result['soup_rows'] is not None else "BeautifulSoup missed it (table is in a comment)"
+        print(f"{result['page']}: {result['rows']} rows | BeautifulSoup {result['soup_ms']:.1f} ms | "
+              f"lxml {result['lxml_ms']:.1f} ms | {speedup:.1f}x | identical rows: {identical}")
@@ -6,11 +6,26 @@ import json
 from pathlib import Path
 import hashlib
 import time
+import logging
+from collections import deque
+import numpy as np
 import pandas as pd
+import projection_service
+import player_analysis
+import player_trends
+from expert_rankings import rankings_path, read_rankings
+from player_ids import names_by_id, player_id, player_id_series
+from vor import VorEngine, fills_starting_spot
+from draft_snapshot import DraftJournal, delete_snapshot, read_snapshot, snapshot_path
+from pick_recommender import (DraftPool, auto_draft_candidates, draft_positions, position_index, position_multipliers,
+                              rank_factor, recommend, round_position_weights, run_window)
+
+logger = logging.getLogger(__name__)
 
 class Player:
-    def __init__(self, name, pos, team='', bye='', avg_rank=999):
+    def __init__(self, name, pos, team='', bye='', avg_rank=999, id=None):
         self.name = name
+        self.id = player_id(name) if id is None else id  # Stable integer key, see player_ids
         self.pos = pos
         self.team = team
         self.bye = bye
@@ -19,8 +34,14 @@ class Player:
     def __str__(self):
         return f"{self.name} ({self.pos})"
 
+def players_from_pool(pool):
+    """Players from (player id, name, position, team, bye, rank) rows, as read_rankings and snapshots give them"""
+    return [Player(name=name, pos=pos, team=team, bye=bye, avg_rank=rank, id=key)
+            for key, name, pos, team, bye, rank in pool]
+
 class DraftHelper:
-    def __init__(self, total_teams, your_position, total_rounds=15, roster_limits=None, lineup_settings=None, auto_draft=False):
+    def __init__(self, total_teams, your_position, total_rounds=15, roster_limits=None, lineup_settings=None, auto_draft=False,
+                 players=None, ranking_type='expert'):
         self.total_teams = total_teams
         self.your_position = your_position
         self.total_rounds = total_rounds
@@ -49,161 +70,81 @@ class DraftHelper:
         
         # Initialize basic structures
         self.drafted_players = {i: [] for i in range(1, total_teams + 1)}
+        self.drafted_ids = set()  # player ids of everyone in drafted_players
+        # Kept by draft_player, one column per draft_positions entry: each team's roster counts (team n in
+        # row n - 1), the spots each team still has to fill and their league-wide total
+        self.roster_limit_vector = np.array([self.roster_limits.get(pos, 0) for pos in draft_positions])
+        self.position_count_matrix = np.zeros((total_teams, len(draft_positions)), dtype=int)
+        self.need_matrix = np.tile(self.roster_limit_vector, (total_teams, 1))
+        self.league_needs = self.need_matrix.sum(axis=0)
+        # Positions of the league's latest picks and how many of them went to each position
+        self.recent_picks = deque(maxlen=run_window)
+        self.run_counts = np.zeros(len(draft_positions), dtype=int)
+        self.available_counts = np.zeros(len(draft_positions), dtype=int)
         self.team_names = {i: f"Team {i}" for i in range(1, total_teams + 1)}
         self.use_team_names = False
         self.available_players = []
+        self.vor = None  # Value over replacement, when the rankings have projected points
+        self.board_ranks = {}  # player id -> place on the board, 1 is best
+        self.ranking_type = ranking_type
+        self.journal = None  # draft_snapshot.DraftJournal saving this draft, once the app starts one
         
-        # Load players
-        success = self.load_players()
-        if not success:
+        # Load players, unless a restored draft brings its own pool
+        if players is not None:
+            self.set_players(players, ranking_type)
+        elif not self.load_players(ranking_type):
             raise Exception("Failed to load player rankings.")
 
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Rebuild a saved draft from draft_snapshot.read_snapshot output, without reading any rankings file"""
+        settings = snapshot['settings']
+        helper = cls(settings['total_teams'], settings['your_position'], settings['total_rounds'],
+                     settings['roster_limits'], settings['lineup_settings'], auto_draft=settings['auto_draft'],
+                     players=players_from_pool(snapshot['pool']), ranking_type=snapshot['ranking_type'])
+        players_by_id = {p.id: p for p in helper.available_players}
+        for event in snapshot['events']:
+            if event[0] == 'pick':
+                _, team_number, key = event
+                helper.draft(players_by_id[key], team_number)
+            else:
+                _, ranking_type, pool = event
+                helper.set_players(players_from_pool(pool), ranking_type)
+                players_by_id.update((p.id, p) for p in helper.available_players)
+        return helper
+
     def load_players(self, ranking_type='expert'):
         """Load player rankings from CSV file"""
         try:
-            # First load expert rankings to get player positions
-            expert_rankings_path = os.path.join(os.getcwd(), 'data_used', 'rankings3.csv')
-            player_positions = {}
-            seen_players = set()  # Track seen players to avoid duplicates
-            
-            with open(expert_rankings_path, 'r', encoding='utf-8') as file:
-                content = file.read().replace('"', '').strip('\ufeff')
-                lines = content.split('\n')
-                reader = csv.DictReader(lines)
-                for row in reader:
-                    full_pos = row.get('POS', '')
-                    base_pos = ''.join(c for c in full_pos if not c.isdigit())
-                    player_positions[row['Player'].lower()] = base_pos
+            # Expert rankings: the ranked pool for expert mode, player positions for ML mode
+            rankings_path = os.path.join(os.getcwd(), 'data_used', 'rankings3.csv')
+            if not os.path.exists(rankings_path):
+                print("Rankings file not found.")
+                return False
 
             # Choose file based on ranking type
             if ranking_type == 'ml':
-                # Load both flex.csv (RB/WR/TE) and flex2.csv (QB) for ML rankings
-                flex_path = os.path.join(os.getcwd(), 'data_used', 'flex.csv')
-                flex2_path = os.path.join(os.getcwd(), 'data_used', 'flex2.csv')
-                
-                self.available_players = []  # Reset available players
-                
-                # First process flex.csv for both QB rushing and other positions
-                qb_rushing_points = {}  # Store QB rushing points
-                if os.path.exists(flex_path):
-                    with open(flex_path, 'r', encoding='utf-8') as file:
-                        reader = csv.DictReader(file)
-                        for row in reader:
-                            try:
-                                player_name = row['Player']
-                                if player_name.lower() in seen_players:
-                                    continue
-                                
-                                player_pos = player_positions.get(player_name.lower())
-                                if not player_pos:
-                                    continue
-
-                                try:
-                                    points = float(row['Predicted_FP'])
-                                except ValueError:
-                                    continue
-
-                                if player_pos == 'QB':  # Store QB rushing points for later
-                                    qb_rushing_points[player_name] = points
-                                    print(f"Found rushing points for QB {player_name}: {points}")
-                                elif player_pos in ['RB', 'WR', 'TE']:  # Process other positions normally
-                                    player = Player(
-                                        name=player_name,
-                                        pos=player_pos,
-                                        team=row.get('Team', ''),
-                                        bye=row.get('Bye', ''),
-                                        avg_rank=points
-                                    )
-                                    self.available_players.append(player)
-                                    seen_players.add(player_name.lower())
-                                    
-                            except (KeyError, ValueError) as e:
-                                print(f"Error processing flex.csv row: {row}")
-                                print(f"Error details: {str(e)}")
-                                continue
-
-                # Process flex2.csv (QB)
-                if os.path.exists(flex2_path):
-                    with open(flex2_path, 'r', encoding='utf-8') as file:
-                        reader = csv.DictReader(file)
-                        print("flex2.csv columns:", reader.fieldnames)
-                        for row in reader:
-                            try:
-                                player_name = row['Player']
-                                if player_name.lower() in seen_players:
-                                    continue
-                                
-                                player_pos = 'QB'
-                                
-                                try:
-                                    # Combine passing and rushing points
-                                    pass_points = float(row['Predicted_FP'])
-                                    rush_points = qb_rushing_points.get(player_name, 0)  # Get rushing points or 0 if none
-                                    total_points = pass_points + rush_points
-                                    print(f"Processing QB {player_name}: {pass_points} passing + {rush_points} rushing = {total_points} total")
-                                    
-                                except ValueError as e:
-                                    print(f"Value error for {player_name}: {e}")
-                                    continue
-                                
-                                player = Player(
-                                    name=player_name,
-                                    pos=player_pos,
-                                    team=row.get('Team', ''),
-                                    bye=row.get('Bye', ''),
-                                    avg_rank=total_points
-                                )
-                                self.available_players.append(player)
-                                seen_players.add(player_name.lower())
-                                
-                            except (KeyError, ValueError) as e:
-                                print(f"Error processing flex2.csv row: {row}")
-                                print(f"Error details: {str(e)}")
-                                continue
+                # One combined table: scored in process from the saved models, else the pipeline's projections.csv
+                projections, projections_source = ml_projection_table()
+                if projections is None:
+                    self.set_players([], ranking_type)
+                    return True
 
+                rankings_stat = os.stat(rankings_path)
+                ranked = ml_rankings(projections, projections_source, rankings_path,
+                                     (rankings_stat.st_mtime_ns, rankings_stat.st_size))
+                players = [
+                    Player(name=name, pos=pos, avg_rank=points, id=key)
+                    for name, pos, points, key in zip(ranked['Player'], ranked['Pos'], ranked['Points'].tolist(),
+                                                      ranked['Id'].tolist())
+                ]
+                logger.debug("Loaded %d ML rankings", len(players))
+                self.set_players(players, ranking_type)
                 return True  # Return True if we successfully loaded ML rankings
                 
             else:
-                # Expert rankings processing (unchanged)
-                filename = 'rankings3.csv'
-                rankings_path = os.path.join(os.getcwd(), 'data_used', filename)
-                
-                if not os.path.exists(rankings_path):
-                    print("Rankings file not found.")
-                    return False
-                
-                self.available_players = []
-                
-                with open(rankings_path, 'r', encoding='utf-8') as file:
-                    reader = csv.DictReader(file)
-                    for row in reader:
-                        try:
-                            player_name = row['Player']
-                            if player_name.lower() in seen_players:
-                                continue
-                            
-                            full_pos = row.get('POS', '')
-                            player_pos = ''.join(c for c in full_pos if not c.isdigit())
-                            try:
-                                rank_value = float(row.get('Rank', 999))
-                            except ValueError:
-                                rank_value = 999
-                        
-                            player = Player(
-                                name=player_name,
-                                pos=player_pos,
-                                team=row.get('Team', ''),
-                                bye=row.get('Bye', ''),
-                                avg_rank=rank_value
-                            )
-                            self.available_players.append(player)
-                            seen_players.add(player_name.lower())
-                            
-                        except (KeyError, ValueError) as e:
-                            print(f"Error processing row: {row}")
-                            print(f"Error details: {str(e)}")
-                            continue
-
+                _, pool = read_rankings(rankings_path)
+                self.set_players(players_from_pool(pool), ranking_type)
                 return True
                 
         except Exception as e:
@@ -292,6 +233,62 @@ class DraftHelper:
         
         return matching_players
 
+    def set_players(self, players, ranking_type):
+        """Make players the pool for ranking_type: avg_rank is the expert rank, or projected points for 'ml'"""
+        self.available_players = players
+        self.ranking_type = ranking_type
+        if ranking_type == 'ml':
+            # Highest projection first
+            by_points = sorted(players, key=lambda p: p.avg_rank, reverse=True)
+            self.board_ranks = {p.id: rank for rank, p in enumerate(by_points, 1)}
+            self.count_available()
+            self.build_vor()
+        else:
+            self.board_ranks = {p.id: p.avg_rank for p in players}
+            self.count_available()
+            # Expert ranks already weigh positions against each other and have no points to compare
+            self.vor = None
+        if self.journal is not None:
+            self.journal.record_pool(ranking_type, players)
+
+    def build_vor(self):
+        """Value over replacement for the loaded pool's projected points, with the picks so far taken out"""
+        self.vor = VorEngine([p.id for p in self.available_players], [p.pos for p in self.available_players],
+                             [p.avg_rank for p in self.available_players],
+                             self.lineup_settings, self.roster_limits, self.total_teams)
+        for roster in self.drafted_players.values():
+            position_counts = {}
+            for player in roster:
+                self.vor.remove(player.id, fills_starting_spot(position_counts, player.pos, self.lineup_settings))
+                position_counts[player.pos] = position_counts.get(player.pos, 0) + 1
+
+    def count_available(self):
+        """Undrafted players left at each position, from a freshly loaded pool"""
+        self.available_counts[:] = 0
+        for player in self.available_players:
+            if player.id not in self.drafted_ids and player.pos in position_index:
+                self.available_counts[position_index[player.pos]] += 1
+
+    def position_counts(self, team_number):
+        """{position: players} on a team's roster"""
+        return {pos: int(count) for pos, count in zip(draft_positions, self.position_count_matrix[team_number - 1])
+                if count}
+
+    def record_pick(self, player, team_number):
+        """Update the position count, need and run vectors for one pick: O(positions)"""
+        code = position_index.get(player.pos)
+        if code is None:
+            return
+        self.position_count_matrix[team_number - 1, code] += 1
+        if self.need_matrix[team_number - 1, code] > 0:
+            self.need_matrix[team_number - 1, code] -= 1
+            self.league_needs[code] -= 1
+        if len(self.recent_picks) == self.recent_picks.maxlen:
+            self.run_counts[self.recent_picks[0]] -= 1
+        self.recent_picks.append(code)
+        self.run_counts[code] += 1
+        self.available_counts[code] -= 1
+
     def draft_player(self, player_name, team_number):
         """Mark a player as drafted by a specific team"""
         matching_players = self.find_player(player_name)
@@ -301,17 +298,27 @@ class DraftHelper:
         elif len(matching_players) > 1:
             return False, matching_players
         else:
-            player = matching_players[0]
-            self.drafted_players[team_number].append(player)
-            self.available_players.remove(player)
-            return True, player
+            return self.draft(matching_players[0], team_number)
+
+    def draft(self, player, team_number):
+        """Give an available player to a team and save the pick to the draft's snapshot"""
+        if self.vor is not None:
+            self.vor.remove(player.id, fills_starting_spot(self.position_counts(team_number), player.pos,
+                                                           self.lineup_settings))
+        self.drafted_players[team_number].append(player)
+        self.drafted_ids.add(player.id)
+        self.record_pick(player, team_number)
+        self.available_players.remove(player)
+        if self.journal is not None:
+            self.journal.record_pick(team_number, player.id)
+        return True, player
 
     def get_best_available(self, position=None, top_n=None):
         available = []
         
         for player in self.available_players:
             # Skip if player is already drafted
-            if any(p.name == player.name for team in self.drafted_players.values() for p in team):
+            if player.id in self.drafted_ids:
                 continue
                 
             # Add player if no position filter or matches position
@@ -338,6 +345,9 @@ class DraftHelper:
                         player.pos_rank = rank
                     ranked_players.extend(pos_players)
                 available = ranked_players
+            elif self.vor is not None:
+                # Value over replacement compares positions; ties go to the higher projection
+                available.sort(key=lambda x: (self.vor.value(x.id), float(x.avg_rank)), reverse=True)
             else:
                 available.sort(key=lambda x: float(x.avg_rank), reverse=True)  # Highest points first
         else:
@@ -412,7 +422,7 @@ class DraftHelper:
         
         for player in self.available_players:
             # Skip if player is already drafted
-            if any(p.name == player.name for team in self.drafted_players.values() for p in team):
+            if player.id in self.drafted_ids:
                 continue
                 
             # Add player if matches position
@@ -430,22 +440,7 @@ class DraftHelper:
 
     def get_team_needs(self, team_number):
         """Calculate team needs based on current roster and limits"""
-        roster = self.drafted_players.get(team_number, [])
-        needs = {}
-        
-        # Count current positions
-        position_counts = {'QB': 0, 'RB': 0, 'WR': 0, 'TE': 0, 'K': 0, 'DST': 0}
-        for player in roster:
-            if player.pos in position_counts:
-                position_counts[player.pos] += 1
-        
-        # Calculate needs based on roster limits
-        for pos, count in position_counts.items():
-            max_limit = self.roster_limits.get(pos, 0)
-            if count < max_limit:
-                needs[pos] = max_limit - count
-        
-        return needs
+        return {pos: int(need) for pos, need in zip(draft_positions, self.need_matrix[team_number - 1]) if need > 0}
 
     def auto_draft_pick(self, team_number):
         """Make an automated draft pick for the given team"""
@@ -457,47 +452,11 @@ class DraftHelper:
         total_picks = sum(len(players) for players in self.drafted_players.values())
         current_round = (total_picks // self.total_teams) + 1
         
-        # Position priorities based on round
-        if current_round <= 4:
-            # First 4 rounds: Focus heavily on RB/WR
-            position_weights = {
-                'RB': 0.5,
-                'WR': 0.4,
-                'TE': 0.07,
-                'QB': 0.03,
-                'DST': 0,
-                'K': 0
-            }
-        elif current_round <= 8:
-            # Middle rounds: Start considering QB/TE more
-            position_weights = {
-                'RB': 0.35,
-                'WR': 0.35,
-                'TE': 0.15,
-                'QB': 0.15,
-                'DST': 0,
-                'K': 0
-            }
-        elif current_round <= 13:
-            # Later rounds: Consider all positions except K/DST
-            position_weights = {
-                'RB': 0.25,
-                'WR': 0.25,
-                'TE': 0.25,
-                'QB': 0.25,
-                'DST': 0,
-                'K': 0
-            }
-        else:
-            # Final rounds: K/DST priority
-            position_weights = {
-                'RB': 0.1,
-                'WR': 0.1,
-                'TE': 0.1,
-                'QB': 0.1,
-                'DST': 0.3,
-                'K': 0.3
-            }
+        # Position priorities based on round, raised for positions on a run or that other teams still need
+        other_needs = self.league_needs - self.need_matrix[team_number - 1]
+        multipliers = position_multipliers(self.run_counts, other_needs, self.available_counts)
+        position_weights = {pos: weight * multipliers[position_index[pos]]
+                            for pos, weight in round_position_weights(current_round).items()}
         
         # Get candidates for each needed position
         candidates = []
@@ -506,7 +465,7 @@ class DraftHelper:
                 available = self.get_best_available_by_position(pos)
                 if available:
                     # Take top players at each position
-                    top_players = available[:3]
+                    top_players = available[:auto_draft_candidates]
                     # Add position weight to each player
                     for player in top_players:
                         candidates.append((player, position_weights[pos]))
@@ -529,8 +488,7 @@ class DraftHelper:
         final_weights = []
         for player, base_weight in zip(players, weights):
             # Add some randomness but maintain ranking influence
-            rank_factor = 1 / (float(player.avg_rank) + 1)  # Prevent division by zero
-            final_weight = base_weight * rank_factor
+            final_weight = base_weight * rank_factor(self.board_ranks[player.id])
             final_weights.append(final_weight)
         
         # Normalize weights
@@ -538,7 +496,36 @@ class DraftHelper:
         final_weights = [w/total_weight for w in final_weights]
         
         selected_player = random.choices(players, weights=final_weights, k=1)[0]
-        return self.draft_player(selected_player.name, team_number)
+        return self.draft(selected_player, team_number)
+
+    def recommend_picks(self, pick_number, budget_seconds=0.2, top_n=10):
+        """Lookahead recommendations for your pick at pick_number.
+
+        Simulates the other teams' picks until your next turn with the
+        auto-draft model and returns (recommendations, stats) from
+        pick_recommender.recommend, with a player column added.
+        """
+        available = [p for p in self.available_players if p.id not in self.drafted_ids]
+        if self.ranking_type == 'ml':
+            values = [self.vor.value(p.id) if self.vor is not None else p.avg_rank for p in available]
+        else:
+            values = [-p.avg_rank for p in available]  # Higher is better, in places on the board
+        pool = DraftPool([p.id for p in available], [p.pos for p in available], values,
+                         [self.board_ranks.get(p.id, len(self.board_ranks) + 1) for p in available])
+
+        # Every pick between this one and your next
+        upcoming = []
+        for later_pick in range(pick_number + 1, self.total_teams * self.total_rounds + 1):
+            team = self.get_current_drafter(later_pick)
+            if team == self.your_position:
+                break
+            upcoming.append((team, (later_pick - 1) // self.total_teams + 1))
+
+        recommendations, stats = recommend(pool, self.your_position, self.position_count_matrix, self.recent_picks,
+                                           upcoming, self.roster_limits, budget_seconds, top_n=top_n)
+        players = {p.id: p for p in available}
+        recommendations.insert(0, 'player', [players[player_id] for player_id in recommendations['id']])
+        return recommendations, stats
 
 def hash_password(password):
     """Hash a password using SHA-256"""
@@ -560,15 +547,27 @@ def save_user_data(data):
 def save_user_favorites(username, favorites):
     """Save user favorites to the JSON file"""
     data = load_user_data()
-    data['users'][username]['favorites'] = list(favorites)
+    data['users'][username]['favorites'] = list(favorites.values())
     save_user_data(data)
 
 def save_user_busts(username, busts):
     """Save user favorites to the JSON file"""
     data = load_user_data()
-    data['users'][username]['busts'] = list(busts)
+    data['users'][username]['busts'] = list(busts.values())
     save_user_data(data)
 
+def resume_draft(snapshot, path):
+    """Put a saved draft back into the session; later picks keep appending to its snapshot"""
+    helper = DraftHelper.from_snapshot(snapshot)
+    helper.journal = DraftJournal(path, snapshot['pools'])
+    st.session_state.helper = helper
+    st.session_state.team_names = snapshot['team_names']
+    st.session_state.using_ml = helper.ranking_type == 'ml'
+    st.session_state.cpu_pick_time = snapshot['settings'].get('cpu_pick_time', 5)
+    st.session_state.current_pick = sum(len(roster) for roster in helper.drafted_players.values()) + 1
+    st.session_state.setup_complete = True
+    st.session_state.page = "Main"
+
 def load_historical_data():
     """Load historical season data for players"""
     try:
@@ -585,6 +584,98 @@ def load_historical_data():
         st.error(f"Unexpected error loading historical data: {e}")
         return pd.DataFrame()
 
+@st.cache_resource
+def load_projection_model(name, version):
+    """Load a saved projection model once per server process"""
+    return projection_service.load_model(name, version)
+
+@st.cache_data
+def cached_projections(name, version, pool_hash):
+    """Score a model's whole player pool; cached per model version and pool contents (pool_hash)"""
+    return projection_service.score_player_pool(name, load_projection_model(name, version))
+
+@st.cache_data
+def cached_projection_table(skilled_source, passing_source):
+    """Combined projections from both saved models; cached per model versions and player pool contents"""
+    return projection_service.combine_projections(cached_projections('skilled', *skilled_source),
+                                                  cached_projections('passing', *passing_source))
+
+@st.cache_data
+def ml_rankings(_projections, projections_source, rankings_path, rankings_version):
+    """Player, Id, Pos and Points for the ML rankings: projections joined to expert positions on player id.
+
+    Cached per projections_source (what the table was built from) and rankings
+    file version (mtime and size), so neither the table nor the file is hashed.
+    """
+    positions, _ = read_rankings(rankings_path)
+    keys = player_id_series(_projections['Player'])
+    merged = _projections.assign(Pos=keys.map(positions))[~keys.duplicated()]
+
+    skill = merged['Pos'].isin(['RB', 'WR', 'TE']) & merged['Scrimmage_FP'].notna()
+    # Everyone else with a passing projection is a QB; passing and rushing points are already summed
+    qb = ~skill & merged['Passing_FP'].notna()
+    if logger.isEnabledFor(logging.DEBUG):
+        for name in merged.loc[~(skill | qb), 'Player']:
+            logger.debug("No ML projection for %s's expert position, skipping", name)
+
+    return pd.DataFrame({
+        'Player': merged['Player'],
+        'Id': keys[~keys.duplicated()],
+        'Pos': merged['Pos'].where(skill, 'QB'),
+        'Points': merged['Scrimmage_FP'].where(skill, merged['Projected_FP']),
+    })[skill | qb].reset_index(drop=True)
+
+def ml_projection_table():
+    """(combined projections, source) for the ML rankings, from the saved models if both exist, else projections.csv.
+
+    source identifies the models and player pools or the projections.csv contents; the table is None if neither exists.
+    """
+    skilled_source = projection_service.projection_source('skilled')
+    passing_source = projection_service.projection_source('passing')
+    if skilled_source is not None and passing_source is not None:
+        try:
+            return cached_projection_table(skilled_source, passing_source), (skilled_source, passing_source)
+        except Exception as e:
+            logger.warning("Could not score with the saved models, using %s: %s",
+                           projection_service.projections_path, e)
+    projections = projection_service.load_projection_table()
+    if projections is None:
+        return None, None
+    return projections, projection_service.file_hash(projection_service.projections_path)
+
+@st.cache_data
+def cached_player_analysis(source_versions):
+    """Breakout / consistency summary for the ranked players; cached per version (mtime and size) of its source files"""
+    seasons = player_analysis.load_season_table()
+    return player_analysis.analyze_players(seasons, player_ids=set(read_rankings(rankings_path)[0]))
+
+def player_analysis_table():
+    """Breakout / consistency summary for the ranked players, or None if a season or rankings file is missing"""
+    versions = source_versions([*player_analysis.season_paths.values(), rankings_path])
+    return None if versions is None else cached_player_analysis(versions)
+
+def source_versions(paths):
+    """(mtime, size) of every path, the cache key for tables built from those files; None if one is missing"""
+    try:
+        return tuple((source.st_mtime_ns, source.st_size) for source in map(os.stat, paths))
+    except OSError:
+        return None
+
+@st.cache_resource
+def cached_trend_table(versions):
+    """Trend table shared by every session; rebuilt when a source file changes"""
+    return player_trends.build_trend_table()
+
+def trend_table():
+    """Precomputed per-player trends, or None if a season file is missing"""
+    versions = source_versions([*player_analysis.season_paths.values(), player_trends.fantasy_path])
+    return None if versions is None else cached_trend_table(versions)
+
+@st.cache_data
+def fantasy_season_rows(versions):
+    """fantasy_merged_7_17.csv, the season rows the Stat Search page filters"""
+    return pd.read_csv(player_trends.fantasy_path)
+
 def main():
     # Initialize session state variables if they don't exist
     if 'page' not in st.session_state:
@@ -637,9 +728,9 @@ def main():
     if 'selected_stats_player' not in st.session_state:
         st.session_state.selected_stats_player = None
     if 'favorites' not in st.session_state:
-        st.session_state.favorites = set()
+        st.session_state.favorites = {}  # player id -> name
     if 'busts' not in st.session_state:
-        st.session_state.busts = set()
+        st.session_state.busts = {}  # player id -> name
     if 'helper' not in st.session_state:
         st.session_state.helper = None
     if 'auto_drafting' not in st.session_state:
@@ -662,7 +753,7 @@ def main():
                         st.session_state.authenticated = True
                         st.session_state.username = username
                         # Load user favorites
-                        st.session_state.favorites = set(user_data['users'][username].get('favorites', []))
+                        st.session_state.favorites = names_by_id(user_data['users'][username].get('favorites', []))
                         st.success("Login successful!")
                         st.rerun()
                     else:
@@ -674,7 +765,7 @@ def main():
             if st.button("Continue as Guest"):
                 st.session_state.authenticated = True
                 st.session_state.username = "Guest"
-                st.session_state.favorites = set()  # Initialize favorites for guest
+                st.session_state.favorites = {}  # Initialize favorites for guest
                 st.success("Continuing as Guest!")
                 st.rerun()
         
@@ -727,6 +818,31 @@ def main():
 
     if st.session_state.page == "Setup":
         st.title("Fantasy Football Draft Helper")
+
+        # A draft saved by an earlier session, e.g. before a refresh, restart or logout; guests' drafts aren't saved
+        saved_draft = None
+        if st.session_state.username != "Guest":
+            saved_path = snapshot_path(st.session_state.username)
+            try:
+                saved_draft = read_snapshot(saved_path)
+            except (ValueError, KeyError) as e:
+                st.warning(f"Could not read your saved draft: {e}")
+        if saved_draft is not None:
+            saved_picks = sum(1 for event in saved_draft['events'] if event[0] == 'pick')
+            st.info(f"You have a saved draft: {saved_draft['settings']['total_teams']} teams, {saved_picks} picks made.")
+            resume_col, discard_col = st.columns(2)
+            with resume_col:
+                if st.button("Resume Saved Draft"):
+                    try:
+                        resume_draft(saved_draft, saved_path)
+                    except (KeyError, ValueError) as e:
+                        st.error(f"Could not restore the saved draft: {e}")
+                    else:
+                        st.rerun()
+            with discard_col:
+                if st.button("Discard Saved Draft"):
+                    delete_snapshot(saved_path)
+                    st.rerun()
         
         # Setup inputs in a horizontal layout
         col1, col2, col3 = st.columns(3)
@@ -773,6 +889,16 @@ def main():
                     auto_draft=auto_draft
                 )
                 st.session_state.team_names = {i: f"Team {i}" for i in range(1, total_teams + 1)}
+                # Save the draft as it goes, replacing any earlier saved draft; like favorites, not for guests
+                if st.session_state.username != "Guest":
+                    draft_settings = {'total_teams': total_teams, 'your_position': your_position,
+                                      'total_rounds': total_rounds, 'roster_limits': roster_limits,
+                                      'lineup_settings': lineup_settings, 'auto_draft': auto_draft,
+                                      'cpu_pick_time': st.session_state.get('cpu_pick_time', 5)}
+                    helper = st.session_state.helper
+                    helper.journal = DraftJournal.start(snapshot_path(st.session_state.username), draft_settings,
+                                                        st.session_state.team_names, helper.ranking_type,
+                                                        helper.available_players)
                 st.success("Draft setup complete!")
                 st.session_state.setup_complete = True
                 st.session_state.page = "Main"
@@ -824,16 +950,17 @@ def main():
                         for player in matching_players:
                             col1_search, col2_search = st.columns([4, 1])
                             indicators = ""
-                            if player.name in st.session_state.favorites:
+                            if player.id in st.session_state.favorites:
                                 indicators += " ⭐"
-                            if player.name in st.session_state.busts:
+                            if player.id in st.session_state.busts:
                                 indicators += " 🚫"
                             with col1_search:
                                 if getattr(st.session_state, 'using_ml', False):
                                     if getattr(st.session_state, 'show_position_ranks', False):
                                         st.write(f"{player.name}{indicators} ({player.pos}) - Position Rank: {getattr(player, 'pos_rank', 'N/A')}")
                                     else:
-                                        st.write(f"{player.name}{indicators} ({player.pos}) - Projected Points: {player.avg_rank:.1f}")
+                                        st.write(f"{player.name}{indicators} ({player.pos}) - Projected Points: {player.avg_rank:.1f}"
+                                                 + (f" - VOR: {st.session_state.helper.vor.value(player.id):+.1f}" if st.session_state.helper.vor else ""))
                                 else:
                                     st.write(f"{player.name}{indicators} ({player.pos}) - Rank: {int(player.avg_rank)}")
                             with col2_search:
@@ -914,11 +1041,11 @@ def main():
                     best_available = []  # Initialize best_available list
                     if position == 'Favorites':
                         best_available = [p for p in st.session_state.helper.available_players 
-                                        if p.name in st.session_state.favorites]
+                                        if p.id in st.session_state.favorites]
                         best_available.sort(key=lambda x: x.avg_rank)
                     elif position == 'Busts':
                         best_available = [p for p in st.session_state.helper.available_players 
-                                        if p.name in st.session_state.busts]
+                                        if p.id in st.session_state.busts]
                         best_available.sort(key=lambda x: x.avg_rank)
                     elif position == 'All': 
                         best_available = st.session_state.helper.get_best_available(top_n=10)
@@ -930,16 +1057,17 @@ def main():
                             col1, col2 = st.columns([4, 1])
                             # Add indicator for favorite and bust
                             indicators = ""
-                            if player.name in st.session_state.favorites:
+                            if player.id in st.session_state.favorites:
                                 indicators += " ⭐"
-                            if player.name in st.session_state.busts:
+                            if player.id in st.session_state.busts:
                                 indicators += " 🚫"
                             with col1:
                                 if getattr(st.session_state, 'using_ml', False):
                                     if getattr(st.session_state, 'show_position_ranks', False):
                                         st.write(f"{player.name}{indicators} ({player.pos}) - Position Rank: {getattr(player, 'pos_rank', 'N/A')}")
                                     else:
-                                        st.write(f"{player.name}{indicators} ({player.pos}) - Projected Points: {player.avg_rank:.1f}")
+                                        st.write(f"{player.name}{indicators} ({player.pos}) - Projected Points: {player.avg_rank:.1f}"
+                                                 + (f" - VOR: {st.session_state.helper.vor.value(player.id):+.1f}" if st.session_state.helper.vor else ""))
                                 else:
                                     st.write(f"{player.name}{indicators} ({player.pos}) - Rank: {int(player.avg_rank)}")
                             with col2:
@@ -955,6 +1083,23 @@ def main():
                         else:
                             st.info(f"No available {position} players.")
 
+                    if current_team == st.session_state.helper.your_position:
+                        with st.expander("Pick Recommendations"):
+                            if st.button("Look ahead to my next pick", key="recommend_picks"):
+                                recommendations, stats = st.session_state.helper.recommend_picks(st.session_state.current_pick)
+                                st.session_state.recommendations = (st.session_state.current_pick, recommendations, stats)
+                            saved = st.session_state.get('recommendations')
+                            if saved and saved[0] == st.session_state.current_pick:
+                                _, recommendations, stats = saved
+                                if recommendations.empty:
+                                    st.info("No available players to recommend")
+                                else:
+                                    st.caption(f"{stats['rollouts']} simulated drafts to your next pick in {stats['seconds'] * 1000:.0f} ms")
+                                for row in recommendations.itertuples():
+                                    st.write(f"{row.player.name} ({row.pos}) - Value: {row.value:.1f} - "
+                                             f"Lost by waiting at {row.pos}: {row.dropoff:.1f} - "
+                                             f"Still there next pick: {row.survival:.0%}")
+
         # Navigation buttons in a horizontal layout
         nav_col1, nav_col2, nav_col3 = st.columns(3)
         with nav_col1:
@@ -996,6 +1141,8 @@ def main():
         new_team_name = st.text_input("Rename Team", value=base_team_name)
         if st.button("Rename Team"):
             st.session_state.team_names[team_number] = new_team_name
+            if st.session_state.helper.journal is not None:
+                st.session_state.helper.journal.record_team_name(team_number, new_team_name)
             st.success(f"Renamed to {new_team_name}")
             st.rerun()
 
@@ -1031,9 +1178,9 @@ def main():
                     with col1:
                         st.write(f"{player.name} ({player.pos}) - Rank: {player.avg_rank}")
                     with col2:
-                        if player.name not in st.session_state.favorites:
+                        if player.id not in st.session_state.favorites:
                             if st.button("Favorite", key=f"fav_{player.name}_{player.avg_rank}"):
-                                st.session_state.favorites.add(player.name)
+                                st.session_state.favorites[player.id] = player.name
                                 if st.session_state.username != "Guest":
                                     save_user_favorites(st.session_state.username, st.session_state.favorites)
                                 st.success(f"Added {player.name} to favorites!")
@@ -1046,11 +1193,11 @@ def main():
             if st.session_state.favorites:
                 favorite_players = []
                 for player in st.session_state.helper.available_players:
-                    if player.name in st.session_state.favorites:
+                    if player.id in st.session_state.favorites:
                         favorite_players.append((player, "Available"))
                 for team_num, team_players in st.session_state.helper.drafted_players.items():
                     for player in team_players:
-                        if player.name in st.session_state.favorites:
+                        if player.id in st.session_state.favorites:
                             team_name = st.session_state.team_names.get(team_num, f"Team {team_num}")
                             favorite_players.append((player, f"Drafted by {team_name}"))
                 favorite_players.sort(key=lambda x: x[0].avg_rank)
@@ -1063,7 +1210,7 @@ def main():
                             st.write(f"{player.name} ({player.pos}) - Rank: {int(player.avg_rank)} - {status}")
                     with col2:
                         if st.button("Remove", key=f"remove_{player.name}_{player.avg_rank}"):
-                            st.session_state.favorites.remove(player.name)
+                            del st.session_state.favorites[player.id]
                             if st.session_state.username != "Guest":
                                 save_user_favorites(st.session_state.username, st.session_state.favorites)
                             st.rerun()
@@ -1091,9 +1238,9 @@ def main():
                     with col1:
                         st.write(f"{player.name} ({player.pos}) - Rank: {player.avg_rank}")
                     with col2:
-                        if player.name not in st.session_state.busts:
+                        if player.id not in st.session_state.busts:
                             if st.button("Bust", key=f"bustpage_{player.name}_{player.avg_rank}"):
-                                st.session_state.busts.add(player.name)
+                                st.session_state.busts[player.id] = player.name
                                 if st.session_state.username != "Guest":
                                     save_user_busts(st.session_state.username, st.session_state.busts)
                                 st.success(f"Added {player.name} to busts!")
@@ -1106,11 +1253,11 @@ def main():
             if st.session_state.busts:
                 bust_players = []
                 for player in st.session_state.helper.available_players:
-                    if player.name in st.session_state.busts:
+                    if player.id in st.session_state.busts:
                         bust_players.append((player, "Available"))
                 for team_num, team_players in st.session_state.helper.drafted_players.items():
                     for player in team_players:
-                        if player.name in st.session_state.busts:
+                        if player.id in st.session_state.busts:
                             team_name = st.session_state.team_names.get(team_num, f"Team {team_num}")
                             bust_players.append((player, f"Drafted by {team_name}"))
                 bust_players.sort(key=lambda x: x[0].avg_rank)
@@ -1123,7 +1270,7 @@ def main():
                             st.write(f"{player.name} ({player.pos}) - Rank: {int(player.avg_rank)} - {status}")
                     with col2:
                         if st.button("Remove", key=f"remove_bust_{player.name}_{player.avg_rank}"):
-                            st.session_state.busts.remove(player.name)
+                            del st.session_state.busts[player.id]
                             if st.session_state.username != "Guest":
                                 save_user_busts(st.session_state.username, st.session_state.busts)
                             st.rerun()
@@ -1196,6 +1343,17 @@ def main():
                 player_name = list(st.session_state.player_search_results.keys())[0]
                 display_player_stats(st.session_state.player_search_results[player_name])
 
+        with st.expander("Breakout & Consistent Players"):
+            summary = player_analysis_table()
+            if summary is None:
+                st.info("Season stats or rankings are missing, so there is nothing to analyze.")
+            else:
+                analysis_cols = ['Group', 'Player', 'Pos', 'Current_Age', 'Seasons', 'Total_Yards', 'Total_TD']
+                st.subheader("Potential Breakouts")
+                st.dataframe(player_analysis.breakout_players(summary)[analysis_cols], hide_index=True)
+                st.subheader("Consistent Producers")
+                st.dataframe(player_analysis.consistent_players(summary)[analysis_cols], hide_index=True)
+
         # Back button
         if st.button("Back to Main"):
             st.session_state.page = "Main"
@@ -1212,6 +1370,7 @@ def display_player_stats(years_data):
         player_name = list(years_data[0].keys())[-1]
     
     st.subheader(f"Career Statistics for {player_name}")
+    display_player_trends(player_name)
     
     # Check if it's a QB by looking at position
     is_qb = any(year.get(' Pos') == 'QB' for year in years_data if ' Pos' in year)
@@ -1348,11 +1507,33 @@ def display_player_stats(years_data):
                 
                 st.markdown("---")
 
+trend_titles = {'passing': "Passing", 'scrimmage': "Scrimmage", 'fantasy': "Fantasy (2017-2022)"}
+
+def display_player_trends(player_name):
+    """Year-over-year change and rolling averages for a player, sliced from the precomputed trend table"""
+    trends = trend_table()
+    if trends is None:
+        return
+    with st.expander("Trends"):
+        shown = False
+        for source, title in trend_titles.items():
+            view = trends.player_view(player_name, source)
+            if view.empty:
+                continue
+            view = view.round(1)
+            view.columns = [stat if measure == 'Value' else f"{stat} {measure}" for stat, measure in view.columns]
+            st.write(f"**{title}** (Change: vs previous season, Avg: {player_trends.rolling_seasons}-season average)")
+            st.dataframe(view)
+            shown = True
+        if not shown:
+            st.info(f"No trends for {player_name}")
+
 def stat_search():
     st.title("Player Stat Search")
     
-    # Get the historical data
-    historical_df = st.session_state.historical_data
+    # The page filters fantasy_merged_7_17.csv, which has the FantPos/Year/PPR columns it shows
+    versions = source_versions([player_trends.fantasy_path])
+    historical_df = pd.DataFrame() if versions is None else fantasy_season_rows(versions)
     
     if historical_df.empty:
         st.error("Historical data could not be loaded. Please check that the CSV files exist.")
@@ -1403,6 +1584,10 @@ def stat_search():
                 st.subheader("Skill Position Stats")
                 st.dataframe(skill_df[skill_cols].sort_values(by=['Year', 'PPR'], ascending=[False, False]))
 
+        # Trends once the name filter narrows the rows to one player
+        if player_name and filtered_df['Player'].nunique() == 1:
+            display_player_trends(filtered_df['Player'].iloc[0])
+
 def search_player(name):
     # Convert search name to lowercase for case-insensitive comparison
     search_name = name.lower().strip()
@@ -0,0 +1,95 @@
+"""Value over replacement (VOR) for the draft pool.
+
+A player's VOR is his projected points minus the points of the best player
+at his position who would not start in this league. How many players
+start at each position comes from the league's lineup settings, roster
+limits and team count. FLEX spots go to whichever RB/WR/TE are best after
+the dedicated starters. Baselines are computed once per league, when the
+pool is loaded. After that, drafting a player only recomputes his own
+position, so ranking the board by VOR costs nothing extra per render.
+"""
+import numpy as np
+
+flex_positions = ('RB', 'WR', 'TE')
+
+
+def starter_counts(positions, points, lineup_settings, roster_limits, total_teams):
+    """League-wide starting spots per position, with FLEX spots given to the best remaining RB/WR/TE"""
+    positions = np.asarray(positions)
+    points = np.asarray(points, dtype=float)
+    starters = {pos: lineup_settings.get(pos, 0) * total_teams for pos in set(positions.tolist())}
+
+    # The FLEX spots go to the highest scorers left once each flex position's own starters are taken
+    leftover = []
+    for pos in flex_positions:
+        pos_points = np.sort(points[positions == pos])[::-1]
+        leftover.extend((value, pos) for value in pos_points[starters.get(pos, 0):])
+    leftover.sort(reverse=True)
+    for _, pos in leftover[:lineup_settings.get('FLEX', 0) * total_teams]:
+        starters[pos] += 1
+
+    # A position can't start more players than teams are allowed to roster
+    return {pos: min(count, roster_limits.get(pos, count) * total_teams) for pos, count in starters.items()}
+
+
+def fills_starting_spot(position_counts, pos, lineup_settings):
+    """Whether a team with position_counts would start one more player at pos, counting open FLEX spots"""
+    if position_counts.get(pos, 0) < lineup_settings.get(pos, 0):
+        return True
+    if pos not in flex_positions:
+        return False
+    flex_used = sum(max(0, position_counts.get(flex_pos, 0) - lineup_settings.get(flex_pos, 0))
+                    for flex_pos in flex_positions)
+    return flex_used < lineup_settings.get('FLEX', 0)
+
+
+class VorEngine:
+    """VOR for every player in a pool, kept current as players are drafted.
+
+    ids, positions and points are parallel sequences, one entry per player.
+    """
+
+    def __init__(self, ids, positions, points, lineup_settings, roster_limits, total_teams):
+        self.open_starters = starter_counts(positions, points, lineup_settings, roster_limits, total_teams)
+        ids = np.asarray(ids, dtype=np.int64)
+        positions = np.asarray(positions)
+        points = np.asarray(points, dtype=float)
+
+        # Per position: ids and points sorted best first, and which of them are still available
+        self.pools = {}
+        self.position_of = {}
+        for pos in self.open_starters:
+            order = np.argsort(-points[positions == pos], kind='stable')
+            pos_ids = ids[positions == pos][order]
+            self.pools[pos] = (pos_ids, points[positions == pos][order], np.ones(len(pos_ids), dtype=bool))
+            self.position_of.update(dict.fromkeys(pos_ids.tolist(), pos))
+
+        self.replacement = {}
+        self.values = {}
+        for pos in self.pools:
+            self._update_position(pos)
+
+    def _update_position(self, pos):
+        """Recompute one position's replacement level and the VOR of its available players"""
+        pos_ids, pos_points, available = self.pools[pos]
+        remaining = pos_points[available]
+        open_starters = self.open_starters[pos]
+        # The first player past the open starting spots; with none left, anyone still starting is bench depth
+        self.replacement[pos] = float(remaining[open_starters]) if open_starters < len(remaining) else 0.0
+        self.values.update(zip(pos_ids[available].tolist(), (remaining - self.replacement[pos]).tolist()))
+
+    def remove(self, player_id, fills_starter=True):
+        """Take a drafted player out of the pool; fills_starter is False if he went to a team's bench"""
+        pos = self.position_of.get(player_id)
+        if pos is None or player_id not in self.values:
+            return
+        pos_ids, _, available = self.pools[pos]
+        available[np.flatnonzero(pos_ids == player_id)] = False
+        del self.values[player_id]
+        if fills_starter and self.open_starters[pos] > 0:
+            self.open_starters[pos] -= 1
+        self._update_position(pos)
+
+    def value(self, player_id, default=0.0):
+        """Current VOR of an available player"""
+        return self.values.get(player_id, default)